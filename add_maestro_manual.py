@@ -4,10 +4,8 @@ Manually add Maestro app to catalogue_data.json.
 Since Firebase is serving SPA routes, the catalogue.json isn't accessible yet.
 """
 
-import json
-from datetime import datetime, timezone
-
-CATALOGUE_FILE = 'catalogue_data.json'
+from catalogue_store import CatalogueStore
+from render_site import render_index
 
 # Maestro entry - using GitHub raw URL temporarily until Firebase is redeployed
 MAESTRO_ENTRY = {
@@ -32,30 +30,15 @@ def add_maestro():
     """Add Maestro entry to catalogue_data.json."""
     
     print("Reading catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    items = data.get('items', [])
-    
-    # Check if already exists
-    existing = False
-    for item in items:
-        if item.get('id') == 'maestroV2':
+    with CatalogueStore.open() as store:
+        if store.patch(MAESTRO_ENTRY['id'], source='manual', **MAESTRO_ENTRY):
             print(f"\n⚠️  Maestro entry already exists - updating it")
-            item.update(MAESTRO_ENTRY)
-            existing = True
-            break
-    
-    if not existing:
-        print("\n✅ Adding new Maestro entry...")
-        items.append(MAESTRO_ENTRY)
-    
-    # Update timestamp
-    data['generatedAt'] = datetime.now(timezone.utc).isoformat()
-    
-    print("\nWriting updated catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+        else:
+            print("\n✅ Adding new Maestro entry...")
+            store.upsert(dict(MAESTRO_ENTRY), source='manual')
+        
+        print("\nWriting updated catalogue_data.json...")
+    render_index()
     
     print("✅ Done! Maestro has been added to your homepage.")
     print(f"   Title: {MAESTRO_ENTRY['title']}")
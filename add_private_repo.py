@@ -4,18 +4,20 @@ Manually add a private repo with public deployment to catalogue_data.json.
 This is a workaround for when GITHUB_TOKEN is not set up.
 
 Usage:
-    python add_private_repo.py <deployment_url>
+    python add_private_repo.py <deployment_url> [<deployment_url> ...]
     
 Example:
     python add_private_repo.py https://myproject.netlify.app
+    
+Several URLs are added in one pass: the catalogue is loaded and saved once.
 """
 
 import sys
 import json
 import requests
-from datetime import datetime, timezone
 
-CATALOGUE_FILE = 'catalogue_data.json'
+from catalogue_store import CatalogueStore
+from render_site import render_index
 CATALOGUE_ENTRY_FILE = 'catalogue.json'
 
 def fetch_catalogue_from_url(deployment_url: str) -> dict:
@@ -60,8 +62,8 @@ def resolve_screenshot_url(deployment_url: str, metadata: dict) -> str:
     # Resolve relative to deployment URL
     return f"{deployment_url}/{screenshot}"
 
-def add_private_repo(deployment_url: str):
-    """Add a private repo to catalogue_data.json using its public deployment."""
+def add_private_repo(deployment_url: str, store: CatalogueStore):
+    """Add a private repo to the catalogue store using its public deployment."""
     
     print("=" * 70)
     print("Adding Private Repo to Catalogue")
@@ -114,37 +116,14 @@ def add_private_repo(deployment_url: str):
         "createdAt": None
     }
     
-    # Read existing catalogue
-    print("\nReading catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    items = data.get('items', [])
-    
-    # Check if already exists
-    existing_index = None
-    for i, item in enumerate(items):
-        if item.get('id') == entry['id']:
-            existing_index = i
-            break
-    
-    if existing_index is not None:
+    existing = store.get(entry['id'])
+    if existing is not None:
         print(f"\n⚠️  Entry with id '{entry['id']}' already exists - updating it")
-        old_screenshot = items[existing_index].get('screenshot')
-        items[existing_index] = entry
-        print(f"   Old screenshot: {old_screenshot}")
+        print(f"   Old screenshot: {existing.get('screenshot')}")
         print(f"   New screenshot: {screenshot_url}")
     else:
         print(f"\n✅ Adding new entry with id '{entry['id']}'")
-        items.append(entry)
-    
-    # Update timestamp
-    data['generatedAt'] = datetime.now(timezone.utc).isoformat()
-    
-    # Write back
-    print("\nWriting updated catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    store.upsert(entry, source='private-deployment')
     
     print("\n" + "=" * 70)
     print("✅ SUCCESS!")
@@ -159,15 +138,12 @@ def add_private_repo(deployment_url: str):
         print("Projects tab)")
     print(f"URL: {entry['demoUrl']}")
     print(f"Screenshot: {entry['screenshot']}")
-    print("\nRefresh your homepage to see the changes!")
-    print("\n💡 TIP: Set up GITHUB_TOKEN to automate this in the future")
-    print("   Run: ./setup_github_token.sh")
     
     return True
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python add_private_repo.py <deployment_url>")
+        print("Usage: python add_private_repo.py <deployment_url> [<deployment_url> ...]")
         print("\nExample:")
         print("  python add_private_repo.py https://myproject.netlify.app")
         print("\nThis script will:")
@@ -176,14 +152,30 @@ def main():
         print("  3. Update your homepage automatically")
         sys.exit(1)
     
-    deployment_url = sys.argv[1]
+    # Read existing catalogue once for the whole batch
+    print("Reading catalogue_data.json...")
+    store = CatalogueStore.open()
+    
+    results = []
+    for deployment_url in sys.argv[1:]:
+        # Clean up URL
+        if not deployment_url.startswith('http'):
+            deployment_url = f'https://{deployment_url}'
+        results.append(add_private_repo(deployment_url, store))
     
-    # Clean up URL
-    if not deployment_url.startswith('http'):
-        deployment_url = f'https://{deployment_url}'
+    # Write back once (skipped if every entry was already identical)
+    print("\nWriting updated catalogue_data.json...")
+    if store.save():
+        # The catalogue grids in index.html are prerendered from the catalogue
+        render_index()
+    else:
+        print("   Catalogue already up to date - nothing to write")
     
-    success = add_private_repo(deployment_url)
-    sys.exit(0 if success else 1)
+    if any(results):
+        print("\nRefresh your homepage to see the changes!")
+        print("\n💡 TIP: Set up GITHUB_TOKEN to automate this in the future")
+        print("   Run: ./setup_github_token.sh")
+    sys.exit(0 if all(results) else 1)
 
 if __name__ == '__main__':
     main()
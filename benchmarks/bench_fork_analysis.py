@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark serial vs. concurrent fork analysis in
+update_contributor_projects.get_significant_forks.
+
+Runs both against a local mock of the GitHub API (one detail request plus
+three analysis requests per fork) and checks that they return exactly the
+same contributor projects in the same order. A third run with nothing
+pushed since shows the pushed_at watermark reusing every analysis.
+
+Usage:
+    python benchmarks/bench_fork_analysis.py [repo_count] [latency_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_github import MockGitHub, USERNAME
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    repo_count = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            MockGitHub(repo_count=repo_count, latency=latency) as mock:
+        os.environ['GITHUB_API_URL'] = mock.url
+        os.environ['HOMEPAGE_CACHE_DIR'] = cache_dir
+        os.environ['HTTP_CACHE'] = '0'
+        # Look every parent up on both runs so they do the same work
+        os.environ['CONTRIBUTOR_CACHE_TTL_DAYS'] = '0'
+        import update_contributor_projects as contributors
+
+        serial, serial_time = timed(lambda: contributors.get_significant_forks(
+            USERNAME, workers=1, force_refresh=True))
+        serial_requests = mock.requests
+        concurrent, concurrent_time = timed(lambda: contributors.get_significant_forks(
+            USERNAME, force_refresh=True))
+        concurrent_requests = mock.requests - serial_requests
+        unchanged, unchanged_time = timed(lambda: contributors.get_significant_forks(USERNAME))
+        unchanged_requests = mock.requests - serial_requests - concurrent_requests
+
+    def fingerprint(forks):
+        return [(fork['name'], fork['is_contributor_to_parent'], fork['commits_ahead'],
+                 fork['last_fork_commit']) for fork in forks]
+
+    if fingerprint(serial) != fingerprint(concurrent):
+        print("❌ Concurrent output differs from serial output")
+        sys.exit(1)
+    if fingerprint(serial) != fingerprint(unchanged):
+        print("❌ Reused analyses differ from a full refresh")
+        sys.exit(1)
+
+    forks = sum(repo['fork'] for repo in mock.repos)
+    print(f"Forks: {forks} of {repo_count} repos ({len(serial)} significant), latency {latency * 1000:.0f} ms/request")
+    print(f"  serial      (1 worker):  {serial_time:6.2f}s  {serial_requests} requests")
+    print(f"  concurrent ({contributors.DEFAULT_WORKERS} workers): {concurrent_time:6.2f}s  {concurrent_requests} requests")
+    print(f"  unchanged   (watermark): {unchanged_time:6.2f}s  {unchanged_requests} requests")
+    print(f"  speedup: {serial_time / concurrent_time:.1f}x concurrent, "
+          f"{serial_time / unchanged_time:.1f}x unchanged, identical ordering ✅")
+
+
+if __name__ == '__main__':
+    main()
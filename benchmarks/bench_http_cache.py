@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark a cold vs. warm run of get_github_repos with the on-disk
+conditional-request cache.
+
+The mock API returns ETags and answers matching If-None-Match headers with
+304, as GitHub does; only non-304 responses count against the rate limit.
+
+Usage:
+    python benchmarks/bench_http_cache.py [repo_count] [latency_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mock_github import MockGitHub, USERNAME
+
+
+def main():
+    repo_count = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    with tempfile.TemporaryDirectory() as cache_dir, \
+            MockGitHub(repo_count=repo_count, latency=latency) as mock:
+        os.environ['GITHUB_API_URL'] = mock.url
+        os.environ['HOMEPAGE_CACHE_DIR'] = cache_dir
+        import github_api
+        import update_projects
+
+        runs = []
+        for label in ('cold', 'warm'):
+            before_requests, before_304 = mock.requests, mock.not_modified
+            session = github_api.create_session()
+            start = time.perf_counter()
+            repos = update_projects.get_github_repos(USERNAME, session=session)
+            elapsed = time.perf_counter() - start
+            requests_made = mock.requests - before_requests
+            rate_limited = requests_made - (mock.not_modified - before_304)
+            runs.append((label, elapsed, requests_made, rate_limited, [r['name'] for r in repos]))
+
+    if runs[0][4] != runs[1][4]:
+        print("❌ Cached run returned a different repository list")
+        sys.exit(1)
+
+    for label, elapsed, requests_made, rate_limited, _ in runs:
+        print(f"  {label}: {elapsed:6.2f}s  {requests_made} requests, {rate_limited} counted against rate limit")
+    print("  identical output ✅")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Benchmark parsing one Google Scholar profile page into publication records.
+
+Builds a synthetic profile page (same row markup as scholar.google.com) and
+times publications.parse_publications_page on it. Parsing is purely local,
+so a 100-row page should take milliseconds; the scholarly loop used to sleep
+0.1 s after every row on top of that. `time.sleep` is patched to count
+calls, and the benchmark fails if parsing sleeps at all.
+
+Usage:
+    python benchmarks/bench_publication_parse.py [rows] [iterations]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import publications
+
+AUTHOR_ID = 'wgK6LCYAAAAJ'
+# The old per-row politeness delay in update_publications_scholarly.py
+REMOVED_ROW_DELAY = 0.1
+
+ROW = (
+    '<tr class="gsc_a_tr">'
+    '<td class="gsc_a_t"><a href="/citations?view_op=view_citation&amp;hl=en&amp;user={author}'
+    '&amp;pagesize=100&amp;citation_for_view={author}:{key}" class="gsc_a_at">{title}</a>'
+    '<div class="gs_gray">KE Mathewson, A Author{i}, B Author, C Author</div>'
+    '<div class="gs_gray">Journal of Synthetic Results {i}<span class="gs_oph">, {year}</span></div></td>'
+    '<td class="gsc_a_c"><a href="https://scholar.google.com/scholar?oi=bibs&amp;hl=en&amp;cites={i}" '
+    'class="gsc_a_ac gs_ibl">{cites}</a></td>'
+    '<td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">{year}</span></td>'
+    '</tr>'
+)
+
+
+def profile_page(rows):
+    body = ''.join(ROW.format(author=AUTHOR_ID, key=f'k{i:04d}', title=f'Synthetic publication number {i}',
+                              i=i, year=2000 + i % 25, cites=(i * 37) % 500)
+                   for i in range(rows))
+    return ('<html><body><div id="gsc_a_tw"><table id="gsc_a_t"><tbody id="gsc_a_b">'
+            f'{body}</tbody></table></div></body></html>')
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    html = profile_page(rows)
+
+    sleeps = []
+    real_sleep = time.sleep
+    time.sleep = lambda seconds: sleeps.append(seconds)
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parsed = publications.parse_publications_page(html)
+        elapsed = (time.perf_counter() - start) / iterations
+    finally:
+        time.sleep = real_sleep
+
+    print(f"Profile page: {rows} rows, {len(html) / 1024:.0f} KB, {iterations} iterations")
+    print(f"  parse : {elapsed * 1000:8.2f} ms per page ({elapsed / rows * 1e6:.0f} µs per row)")
+    print(f"  removed per-row sleeps would add {rows * REMOVED_ROW_DELAY:.1f} s per page")
+    if len(parsed) != rows or sleeps:
+        print(f"❌ parsed {len(parsed)} of {rows} rows, {len(sleeps)} sleep calls")
+        sys.exit(1)
+    print(f"  {len(parsed)} rows parsed, no sleeps ✅")
+
+
+if __name__ == '__main__':
+    main()
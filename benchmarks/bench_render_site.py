@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark updating the generated sections of index.html: the previous
+BeautifulSoup parse + DOTALL regex substitutions vs. rendering the page from
+the compiled template in render_site.
+
+Both approaches produce the projects, contributor-projects and publications
+lists from the current data/*.json files, in memory, and the outputs are
+checked to be identical (ignoring the section markers themselves).
+
+Usage:
+    python benchmarks/bench_render_site.py [iterations]
+"""
+
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from catalogue_cards import render_catalogue_sections
+from catalogue_store import CATALOGUE_FILE, load_catalogue
+from render_site import SECTION_DATA, TEMPLATE_FILE, compile_template, load_section_data, render, render_sections
+
+MARKER_PATTERN = re.compile(r'<!-- section:[\w-]+ -->\n|\n<!-- /section:[\w-]+ -->')
+
+
+def legacy_update(content, repos, contributor_html, publications_html):
+    """The pre-splice updaters, run back to back on one string."""
+    # update_projects.update_html_file
+    soup = BeautifulSoup(content, 'html.parser')
+    soup.find('h2', {'id': 'projects'}).find_next('ul')
+    new_items = []
+    for repo in repos:
+        li = soup.new_tag('li')
+        a = soup.new_tag('a', href=repo['html_url'], target='_blank')
+        a.string = repo['name']
+        li.append(a)
+        li.append(f" - {repo['description'] or 'GitHub repository'}")
+        new_items.append(str(li))
+    projects_html = '<ul>\n    ' + '\n    '.join(new_items) + '\n</ul>'
+    content = re.sub(r'<h2 id="projects">Recent Projects</h2>\s*<ul>.*?</ul>',
+                     lambda m: f'<h2 id="projects">Recent Projects</h2>\n{projects_html}',
+                     content, flags=re.DOTALL)
+
+    # update_contributor_projects.update_html_with_contributor_projects
+    content = re.sub(r'<h2 id="contributor-projects">Contributor Projects</h2>\s*<ul>.*?</ul>',
+                     lambda m: f'<h2 id="contributor-projects">Contributor Projects</h2>\n{contributor_html}',
+                     content, flags=re.DOTALL)
+
+    # update_publications.update_html_with_publications
+    pattern = r'(<h2 id="publications">Recent Publications</h2>(?:\s*<p>.*?</p>)?\s*<)(ul|ol reversed)(>)(.*?)(</)(ul|ol)(>)'
+    return re.sub(pattern, lambda m: f'{m.group(1)}ol reversed>\n{publications_html}</ol>',
+                  content, flags=re.DOTALL)
+
+
+def current_lists(data):
+    """The legacy updaters' inputs, built from the section data files."""
+    sections = render_sections(data)
+    publications = sections['publications']
+    publications_html = publications[len('<ol reversed>\n'):-len('</ol>')]
+    return data['projects'], sections['contributor-projects'], publications_html
+
+
+def time_it(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result = func()
+    return (time.perf_counter() - start) / iterations, result
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    os.chdir(ROOT)
+    with open('index.html', 'r', encoding='utf-8') as fh:
+        content = fh.read()
+    with open(TEMPLATE_FILE, 'r', encoding='utf-8') as fh:
+        template = fh.read()
+    data = {name: load_section_data(name) for name in SECTION_DATA}
+    repos, contributor_html, publications_html = current_lists(data)
+    # The catalogue grids aren't touched by the legacy updaters; render them once for both
+    catalogue_sections = render_catalogue_sections(load_catalogue(CATALOGUE_FILE)['items'])
+    legacy_content = MARKER_PATTERN.sub('', content)
+
+    legacy_time, legacy_output = time_it(
+        lambda: legacy_update(legacy_content, repos, contributor_html, publications_html), iterations)
+    compiled = compile_template(template)
+    render_time, render_output = time_it(
+        lambda: render(compiled, dict(render_sections(data), **catalogue_sections)), iterations)
+
+    print(f"index.html: {len(content) / 1024:.0f} KB, {len(repos)} projects, {iterations} iterations")
+    print(f"  parse + regex   : {legacy_time * 1000:8.2f} ms per update")
+    print(f"  template render : {render_time * 1000:8.2f} ms per update")
+    print(f"  speedup         : {legacy_time / render_time:8.1f}x")
+    same = MARKER_PATTERN.sub('', render_output) == legacy_output
+    print(f"  identical output: {'yes' if same else 'NO'}")
+    print(f"  page unchanged  : {'yes' if render_output == content else 'NO'}")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark and check the Scholar profile row extractors in scholar_extract:
+lxml with precompiled XPath vs. the BeautifulSoup html.parser path.
+
+Every page under benchmarks/fixtures/*.html is extracted with both, and
+both results must equal the page's `.expected.json` (title, link, authors,
+venue, year and citations per row). The large profile page is then parsed
+repeatedly to compare throughput.
+
+Usage:
+    python benchmarks/bench_scholar_extract.py [iterations]
+    python benchmarks/bench_scholar_extract.py --update-expected
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import scholar_extract
+
+FIXTURES = os.path.join(ROOT, 'benchmarks', 'fixtures')
+THROUGHPUT_FIXTURE = os.path.join(FIXTURES, 'scholar_profile.html')
+EXTRACTORS = {
+    'lxml + XPath': scholar_extract.extract_rows_lxml,
+    'BeautifulSoup': scholar_extract.extract_rows_bs4,
+}
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as fh:
+        return fh.read()
+
+
+def check_fixtures(update=False):
+    """Compare both extractors with the expected rows; returns True if all match."""
+    ok = True
+    for page in sorted(glob.glob(os.path.join(FIXTURES, '*.html'))):
+        expected_file = page[:-len('.html')] + '.expected.json'
+        html = read(page)
+        if update:
+            with open(expected_file, 'w', encoding='utf-8') as fh:
+                json.dump(scholar_extract.extract_rows_lxml(html), fh, indent=2, ensure_ascii=False)
+                fh.write('\n')
+        expected = json.loads(read(expected_file))
+        for name, extract in EXTRACTORS.items():
+            rows = extract(html)
+            if rows != expected:
+                ok = False
+                mismatch = next((i for i, (a, b) in enumerate(zip(rows, expected)) if a != b), min(len(rows), len(expected)))
+                print(f"❌ {name} differs on {os.path.basename(page)} at row {mismatch} "
+                      f"({len(rows)} rows, expected {len(expected)})")
+        print(f"  {os.path.basename(page):<36} {len(expected):>4} rows")
+    return ok
+
+
+def main():
+    update = '--update-expected' in sys.argv
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    iterations = int(args[0]) if args else 50
+
+    print("Fixtures:")
+    if not check_fixtures(update):
+        sys.exit(1)
+
+    html = read(THROUGHPUT_FIXTURE)
+    timings = {}
+    for name, extract in EXTRACTORS.items():
+        start = time.perf_counter()
+        for _ in range(iterations):
+            rows = extract(html)
+        timings[name] = (time.perf_counter() - start) / iterations
+    print(f"\n{os.path.basename(THROUGHPUT_FIXTURE)}: {len(rows)} rows, {len(html) / 1024:.0f} KB, {iterations} iterations")
+    for name, seconds in timings.items():
+        print(f"  {name:<14}: {seconds * 1000:7.2f} ms per page ({len(rows) / seconds:,.0f} rows/s)")
+    print(f"  speedup       : {timings['BeautifulSoup'] / timings['lxml + XPath']:7.1f}x, identical rows ✅")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Tiny in-process stand-in for the GitHub REST API used by the benchmarks.
+
+Serves a synthetic user with `repo_count` repositories (every fifth one a
+fork of a repository under UPSTREAM) and answers each request after `latency` seconds, which is roughly
+what a round trip to api.github.com costs from a CI runner. GET responses
+carry an ETag and a matching If-None-Match is answered with 304, plus
+X-RateLimit-* headers counting down from 5000 for everything else.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+USERNAME = 'benchuser'
+UPSTREAM = 'upstreamorg'
+
+
+def make_repos(count):
+    base = datetime(2020, 1, 1)
+    repos = []
+    for i in range(count):
+        name = f'repo-{i:03d}'
+        repos.append({
+            'name': name,
+            'full_name': f'{USERNAME}/{name}',
+            'fork': i % 5 == 4,
+            'description': f'Synthetic repository {i}',
+            'html_url': f'https://github.com/{USERNAME}/{name}',
+            'homepage': f'https://{USERNAME}.github.io/{name}' if i % 3 == 0 else '',
+            # REST lists topics alphabetically
+            'topics': sorted(['demo', f'project-topic{i % 4}']) if i % 2 == 0 else [],
+            'default_branch': 'main',
+            'created_at': (base + timedelta(days=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            # A few repos share a commit date so the tie-breakers are exercised
+            'pushed_at': (base + timedelta(days=(i * 7) % 50)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'updated_at': (base + timedelta(days=(i * 7) % 50, hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        })
+    return repos
+
+
+class MockGitHub:
+    """Context manager running the mock API on a free localhost port."""
+
+    def __init__(self, repo_count=120, latency=0.05):
+        self.repos = make_repos(repo_count)
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def __enter__(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                with mock._lock:
+                    mock.requests += 1
+                time.sleep(mock.latency)
+                status, body = mock.route(self.path)
+                payload = json.dumps(body).encode('utf-8')
+                etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+                if status == 200 and self.headers.get('If-None-Match') == etag:
+                    with mock._lock:
+                        mock.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    mock.send_rate_limit(self)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 200:
+                    self.send_header('ETag', etag)
+                mock.send_rate_limit(self)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                with mock._lock:
+                    mock.requests += 1
+                time.sleep(mock.latency)
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                status, body = mock.graphql(request.get('query') or '', request.get('variables') or {})
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def send_rate_limit(self, handler, limit=5000):
+        """GitHub's rate-limit headers; 304s don't count against the budget."""
+        with self._lock:
+            used = self.requests - self.not_modified
+        handler.send_header('X-RateLimit-Limit', str(limit))
+        handler.send_header('X-RateLimit-Remaining', str(max(limit - used, 0)))
+        handler.send_header('X-RateLimit-Reset', str(int(time.time()) + 3600))
+        handler.send_header('X-RateLimit-Resource', 'core')
+
+    def route(self, path):
+        parsed = urlparse(path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == f'/users/{USERNAME}/repos':
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['30'])[0])
+            start = (page - 1) * per_page
+            return 200, self.repos[start:start + per_page]
+
+        match = re.fullmatch(rf'/repos/{USERNAME}/([^/]+)', parsed.path)
+        if match:
+            repo = self.find_repo(match.group(1))
+            if repo is None:
+                return 404, {'message': 'Not Found'}
+            return 200, self.repo_detail(repo)
+
+        match = re.fullmatch(rf'/repos/{UPSTREAM}/([^/]+)/(contributors|commits|compare/.+)', parsed.path)
+        if match:
+            repo = self.find_repo(match.group(1))
+            if repo is None or not repo['fork']:
+                return 404, {'message': 'Not Found'}
+            index = self.repos.index(repo)
+            # The user contributed upstream to every third fork
+            contributed = index % 3 == 0
+            if match.group(2) == 'contributors':
+                logins = ['upstream-maintainer'] + ([USERNAME] if contributed else [])
+                return 200, [{'login': login} for login in logins]
+            if match.group(2) == 'commits':
+                author = query.get('author', [None])[0]
+                if author == USERNAME and not contributed:
+                    return 200, []
+                return 200, [{'commit': {'committer': {'date': repo['pushed_at']}}}]
+            return 200, {'ahead_by': index % 4, 'behind_by': index % 7}
+
+        match = re.fullmatch(rf'/repos/{USERNAME}/([^/]+)/commits', parsed.path)
+        if match:
+            repo = self.find_repo(match.group(1))
+            if repo is None:
+                return 404, {'message': 'Not Found'}
+
+            return 200, [{'commit': {'committer': {'date': repo['pushed_at']}}}]
+
+        return 404, {'message': 'Not Found'}
+
+    def find_repo(self, name):
+        return next((r for r in self.repos if r['name'] == name), None)
+
+    def repo_detail(self, repo):
+        """The /repos/{owner}/{name} payload; forks carry their parent."""
+        detail = dict(repo)
+        if repo['fork']:
+            detail['parent'] = {
+                'full_name': f"{UPSTREAM}/{repo['name']}",
+                'html_url': f"https://github.com/{UPSTREAM}/{repo['name']}",
+                'default_branch': 'main',
+                'pushed_at': repo['created_at'],
+            }
+        return detail
+
+    def graphql(self, query, variables, page_size=100):
+        """Answer the repository listing query used by get_github_repos_graphql.
+
+        Unless the query asks for `privacy: PUBLIC`, the first page also
+        carries a private repository, as it would for a `repo`-scoped token.
+        """
+        start = int(variables.get('cursor') or 0)
+        page = self.repos[start:start + page_size]
+        if start == 0 and 'privacy: PUBLIC' not in query:
+            page = page + [dict(self.repos[0], name='private-repo', full_name=f'{USERNAME}/private-repo',
+                                html_url=f'https://github.com/{USERNAME}/private-repo', private=True)]
+        end = start + len(page)
+        nodes = [{
+            'name': repo['name'],
+            'nameWithOwner': repo['full_name'],
+            'isFork': repo['fork'],
+            'isPrivate': repo.get('private', False),
+            'description': repo['description'],
+            'url': repo['html_url'],
+            'homepageUrl': repo['homepage'],
+            'createdAt': repo['created_at'],
+            'updatedAt': repo['updated_at'],
+            'pushedAt': repo['pushed_at'],
+            # GraphQL returns topics in the order they were added
+            'repositoryTopics': {'nodes': [{'topic': {'name': t}} for t in reversed(repo['topics'])]},
+            'defaultBranchRef': {'name': repo['default_branch'],
+                                 'target': {'committedDate': repo['pushed_at']}},
+        } for repo in page]
+        return 200, {'data': {'user': {'repositories': {
+            'pageInfo': {'hasNextPage': end < len(self.repos), 'endCursor': str(end)},
+            'nodes': nodes,
+        }}}}
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Single entry point for regenerating the dynamic parts of index.html.
+
+Each data source (GitHub projects, contributor projects, Google Scholar
+publications) fetches its records independently and saves them under data/
+(publications are merged into publications_data.json first);
+a source that fails or returns too little keeps its existing data file.
+index.html is then rendered once from templates/index.html (see
+render_site.py) and written atomically, only if it changed.
+
+Usage:
+    python build_site.py [--projects] [--contributors] [--publications]
+                         [--incremental] [--graphql] [--force-refresh] [--full-sync]
+
+With no section flags every source is built. `--incremental` and
+`--graphql` are passed through to the projects build (see update_projects.py),
+`--force-refresh` to the contributors build, where it re-analyses forks that
+have not been pushed since the last run (see update_contributor_projects.py),
+and `--full-sync` makes the publications build walk every Scholar page
+instead of stopping at the first already-stored ones (see publications.py).
+"""
+
+import logging
+import os
+import sys
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+from github_api import create_session, print_cache_summary, print_rate_limit_summary
+from render_site import HTML_FILE, TEMPLATE_FILE, render_index, save_section_data
+
+USERNAME = 'kylemath'
+SCHOLAR_AUTHOR_QUERY = "Kyle Mathewson University of Alberta"
+SCHOLAR_AUTHOR_NAME = "Kyle E Mathewson"
+SCHOLAR_AUTHOR_ID = "wgK6LCYAAAAJ"
+
+
+def fetch_projects(token: Optional[str]) -> Optional[List[Dict]]:
+    from build_thumbnails import build_thumbnails
+    from update_projects import REPO_ACCEPT, update_catalogue
+
+    session = create_session(token, accept=REPO_ACCEPT)
+    repos, entries = update_catalogue(USERNAME, token, session,
+                                      graphql='--graphql' in sys.argv,
+                                      incremental='--incremental' in sys.argv)
+    build_thumbnails()
+    print(f"📦 {len(repos)} repositories, {len(entries)} catalogue entries")
+    print_cache_summary(session)
+    print_rate_limit_summary(session, 'projects')
+    return repos
+
+
+def fetch_contributor_projects(token: Optional[str]) -> Optional[List[Dict]]:
+    from update_contributor_projects import get_significant_forks
+
+    session = create_session(token)
+    contributor_projects = get_significant_forks(USERNAME, token, session,
+                                                 force_refresh='--force-refresh' in sys.argv)
+    print_cache_summary(session)
+    print_rate_limit_summary(session, 'contributor projects')
+    if not contributor_projects:
+        print("No contributor projects found - keeping existing content")
+        return None
+    print(f"🤝 {len(contributor_projects)} contributor projects")
+    return contributor_projects
+
+
+def fetch_publications(token: Optional[str]) -> Optional[List[Dict]]:
+    """Scrape Google Scholar directly, falling back to the scholarly library,
+    and merge the result into publications_data.json.
+
+    Only the newest publications are fetched unless a full sync is due or
+    --full-sync is passed (see publications.py).
+    """
+    from publications import MIN_PUBLICATIONS, is_plausible_fetch, known_publication_ids, store_publications
+    from update_publications import get_google_scholar_publications
+
+    known_ids = known_publication_ids('--full-sync' in sys.argv)
+    full_sync = known_ids is None
+    publications = get_google_scholar_publications(SCHOLAR_AUTHOR_QUERY, SCHOLAR_AUTHOR_ID, known_ids)
+    if not is_plausible_fetch(publications, full_sync):
+        print(f"Basic scraping found {len(publications)} publications - trying scholarly")
+        try:
+            from update_publications_scholarly import get_google_scholar_publications_scholarly
+            publications = get_google_scholar_publications_scholarly(SCHOLAR_AUTHOR_NAME, SCHOLAR_AUTHOR_ID, known_ids)
+        except ImportError as e:
+            print(f"scholarly unavailable: {e}")
+            publications = []
+    if not is_plausible_fetch(publications, full_sync):
+        needed = MIN_PUBLICATIONS if full_sync else 1
+        raise RuntimeError(f"only {len(publications)} publications found (need {needed})")
+    print(f"📚 {len(publications)} publications ({'full' if full_sync else 'incremental'} sync)")
+    return store_publications(publications, full_sync)
+
+
+SOURCES: Dict[str, Callable[[Optional[str]], Optional[List[Dict]]]] = {
+    'projects': fetch_projects,
+    'contributor-projects': fetch_contributor_projects,
+    'publications': fetch_publications,
+}
+FLAGS = {
+    '--projects': 'projects',
+    '--contributors': 'contributor-projects',
+    '--publications': 'publications',
+}
+
+
+def build_site(names: List[str], html_file: str = HTML_FILE, token: Optional[str] = None) -> List[str]:
+    """Refresh the named sources' data and render index.html once; returns failed sources."""
+    failed = []
+    for name in names:
+        start = time.perf_counter()
+        print(f"\n=== {name} ===")
+        try:
+            records = SOURCES[name](token)
+        except Exception as e:
+            print(f"❌ {name} failed, keeping the current data: {e}")
+            traceback.print_exc()
+            failed.append(name)
+            continue
+        if records is not None:
+            if save_section_data(name, records):
+                print(f"📝 {name} data updated")
+            else:
+                print(f"✓ {name} data unchanged")
+        print(f"⏱️  {name} took {time.perf_counter() - start:.1f}s")
+
+    print()
+    render_index(TEMPLATE_FILE, html_file)
+    return failed
+
+
+def main():
+    # Per-row publication progress is logged at DEBUG (LOG_LEVEL=DEBUG)
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+    names = [name for flag, name in FLAGS.items() if flag in sys.argv] or list(SOURCES)
+    failed = build_site(names, token=os.getenv('GITHUB_TOKEN'))
+
+    if failed:
+        print(f"⚠️  Failed sources: {', '.join(failed)}")
+    # Let later workflow steps (e.g. the failure notification) see what broke
+    github_env = os.getenv('GITHUB_ENV')
+    if github_env:
+        with open(github_env, 'a', encoding='utf-8') as fh:
+            fh.write(f"BUILD_FAILED_SOURCES={','.join(failed)}\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Sidecar state shared between build runs.
+
+Every stage that remembers something between runs (ETag cache, fork and
+catalogue watermarks, screenshot/thumbnail/precompress indexes, render
+state) keeps it under CACHE_DIR, which CI restores before each build. The
+JSON files are read with `load_json_state` (a missing or corrupt file is
+simply empty) and written with `save_json_state`, which goes through a temp
+file and rename so an interrupted run never leaves half a file behind.
+"""
+
+import json
+import os
+import threading
+from typing import Dict
+
+CACHE_DIR = os.getenv('HOMEPAGE_CACHE_DIR', '.cache')
+
+
+def load_json_state(path: str) -> Dict:
+    """Load a JSON sidecar file (e.g. under CACHE_DIR); {} if missing or corrupt."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_json_state(path: str, data: Dict):
+    """Write a JSON sidecar file via a temp file and rename."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Download catalogue screenshots once and serve small local thumbnails instead.
+
+Reads the `screenshot` field of every entry in catalogue_data.json, fetches
+each image (revalidating with its ETag on later runs), crops it the way the
+card displays it (2:3, anchored top-left), resizes it and writes a WebP
+thumbnail under images/thumbs/ with a content-hashed filename. Entries get a
+`thumbnail` field pointing at the local file, which the catalogue cards load
+in place of the full-size remote screenshot.
+
+Usage:
+    python build_thumbnails.py
+
+Requires Pillow (pip install Pillow); without it the stage is skipped.
+"""
+
+import hashlib
+import io
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+
+from catalogue_store import load_catalogue, save_catalogue
+from build_state import CACHE_DIR, load_json_state, save_json_state
+from github_api import DEFAULT_WORKERS, create_session
+from render_site import render_index
+from screenshots import MISSING_STATUSES
+
+THUMBNAIL_DIR = os.path.join('images', 'thumbs')
+THUMBNAIL_INDEX_FILE = os.path.join(CACHE_DIR, 'thumbnail_index.json')
+# Cards are 2:3 portrait and at most ~300 CSS px wide; 400x600 covers 2x screens
+THUMBNAIL_SIZE = (400, 600)
+THUMBNAIL_QUALITY = 80
+DOWNLOAD_TIMEOUT = 20
+
+
+def slugify(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')[:40] or 'screenshot'
+
+
+def make_thumbnail(data: bytes) -> Optional[bytes]:
+    """Crop to the card's 2:3 aspect from the top-left and encode as WebP."""
+    from PIL import Image
+
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+    except Exception:
+        return None
+
+    width, height = image.size
+    target_w, target_h = THUMBNAIL_SIZE
+    if width * target_h > height * target_w:
+        image = image.crop((0, 0, height * target_w // target_h, height))
+    else:
+        image = image.crop((0, 0, width, width * target_h // target_w))
+    if image.width > target_w:
+        image = image.resize(THUMBNAIL_SIZE, Image.LANCZOS)
+
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    out = io.BytesIO()
+    image.save(out, 'WEBP', quality=THUMBNAIL_QUALITY, method=6)
+    return out.getvalue()
+
+
+def build_thumbnail(http, entry_id: str, url: str, previous: Optional[Dict]) -> Optional[Dict]:
+    """Return the index record for one screenshot, or None if it can't be fetched.
+
+    Only a 404/410 drops an existing thumbnail; after any other failure
+    (network error, 429, 5xx, an HTML error page) the previous record is
+    kept while its file still exists.
+    """
+    headers = {}
+    if previous and previous.get('path') and os.path.exists(previous['path']):
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('lastModified'):
+            headers['If-Modified-Since'] = previous['lastModified']
+    else:
+        previous = None
+
+    try:
+        response = http.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT)
+    except requests.RequestException:
+        return previous
+    if response.status_code == 304:
+        return previous
+    if response.status_code in MISSING_STATUSES:
+        return None
+    if response.status_code != 200 or not response.headers.get('Content-Type', '').startswith('image/'):
+        return previous
+
+    record = {
+        'etag': response.headers.get('ETag'),
+        'lastModified': response.headers.get('Last-Modified'),
+        'sourceHash': hashlib.sha256(response.content).hexdigest(),
+        'path': None
+    }
+    # Same bytes under a new ETag (e.g. a CDN re-deploy) - keep the existing thumbnail
+    if previous and previous.get('sourceHash') == record['sourceHash'] and os.path.exists(previous.get('path') or ''):
+        record['path'] = previous['path']
+        return record
+
+    thumbnail = make_thumbnail(response.content)
+    if thumbnail is None:
+        return previous
+    digest = hashlib.sha256(thumbnail).hexdigest()[:12]
+    path = os.path.join(THUMBNAIL_DIR, f'{slugify(entry_id)}-{digest}.webp')
+    if not os.path.exists(path):
+        with open(path, 'wb') as fh:
+            fh.write(thumbnail)
+    record['path'] = path
+    return record
+
+
+def build_thumbnails(workers: int = DEFAULT_WORKERS) -> bool:
+    """Generate thumbnails for catalogue_data.json and point entries at them.
+
+    Returns True if catalogue_data.json was rewritten.
+    """
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("⚠️  Pillow not installed - skipping thumbnails. Install with: pip install Pillow")
+        return False
+
+    data = load_catalogue()
+    items = data['items']
+
+    os.makedirs(THUMBNAIL_DIR, exist_ok=True)
+    previous_index = load_json_state(THUMBNAIL_INDEX_FILE)
+    # Screenshots are shared by URL; the first entry using one names the file
+    sources = {}
+    for item in items:
+        if item.get('screenshot') and not item.get('placeholder'):
+            sources.setdefault(item['screenshot'], item.get('id') or 'screenshot')
+
+    # Images are large and have their own index, so keep them out of the HTTP cache
+    session = create_session(cache=False, pool_size=workers)
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        records = executor.map(
+            lambda pair: build_thumbnail(session, pair[1], pair[0], previous_index.get(pair[0])),
+            sources.items()
+        )
+        index = {url: record for url, record in zip(sources, records) if record}
+
+    for item in items:
+        record = index.get(item.get('screenshot'))
+        thumbnail = record['path'].replace(os.sep, '/') if record else None
+        if item.get('thumbnail') != thumbnail:
+            if thumbnail:
+                item['thumbnail'] = thumbnail
+            else:
+                item.pop('thumbnail', None)
+
+    # Drop thumbnails no entry points at any more
+    in_use = {os.path.normpath(record['path']) for record in index.values()}
+    removed = 0
+    for name in os.listdir(THUMBNAIL_DIR):
+        path = os.path.join(THUMBNAIL_DIR, name)
+        if name.endswith('.webp') and os.path.normpath(path) not in in_use:
+            os.remove(path)
+            removed += 1
+
+    save_json_state(THUMBNAIL_INDEX_FILE, index)
+    changed = save_catalogue(data)
+
+    total_bytes = sum(os.path.getsize(record['path']) for record in index.values())
+    print(f"🖼️  {len(index)}/{len(sources)} screenshots thumbnailed into {THUMBNAIL_DIR} "
+          f"({total_bytes / 1024:.0f} KB total, {removed} stale removed)")
+    return changed
+
+
+if __name__ == '__main__':
+    if build_thumbnails():
+        # Cards in index.html are prerendered with the thumbnail paths
+        render_index()
@@ -0,0 +1,175 @@
+"""
+Build-time rendering of the catalogue card grids.
+
+Mirrors `createCard`, `renderItems` and `groupItems` from the inline script
+in templates/index.html, so the project, page and longform grids ship as
+static HTML. The page script only attaches the image-fallback and click
+handlers to prerendered cards instead of fetching catalogue_data.json and
+building them itself. Keep the markup here in step with `createCard`.
+"""
+
+import re
+from typing import Dict, List
+from urllib.parse import quote
+
+from html_sections import escape_attr, escape_text
+
+# Section name -> (grid element id, kind shown in it)
+CATALOGUE_GRIDS = {
+    'catalogue-projects': ('catalogue-grid', 'project'),
+    'catalogue-pages': ('catalogue-pages-grid', 'page'),
+    'catalogue-longform': ('catalogue-longform-grid', 'longform'),
+}
+# Entry fields createCard/generatePlaceholder/getProjectIcon read
+CARD_FIELDS = ('id', 'title', 'oneLiner', 'categories', 'tags', 'demoUrl', 'githubUrl',
+               'screenshot', 'thumbnail', 'placeholder')
+EMPTY_MESSAGE = 'No entries yet—add a catalogue.json file to any repo to feature it here.'
+
+CATEGORY_ICONS = {
+    'eeg': '🧠', 'brain': '🧠', 'neuroscience': '🧠',
+    'game': '🎮', 'soccer': '⚽', 'sport': '⚽',
+    '3dprinting': '🖨️', '3d': '🖨️', 'print': '🖨️',
+    'ai': '🤖', 'ml': '🤖', 'learning': '🤖',
+    'music': '🎵', 'audio': '🎵',
+    'web': '🌐', 'webpage': '🌐',
+    'paint': '🎨', 'art': '🎨', 'creative': '🎨',
+    'terminal': '⌨️', 'cli': '⌨️',
+    'course': '📚', 'education': '📚', 'tutorial': '📚'
+}
+_WORD_BREAK = re.compile(r'(?=[A-Z])|[\s_-]+')
+_CAMEL_BOUNDARY = re.compile(r'([a-z0-9])([A-Z])')
+
+PLACEHOLDER_SVG = '''
+            <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 400 400">
+                <defs>
+                    <linearGradient id="grad{hash}" x1="0%" y1="0%" x2="100%" y2="100%">
+                        <stop offset="0%" style="stop-color:hsl({hue1}, 70%, 60%);stop-opacity:1" />
+                        <stop offset="100%" style="stop-color:hsl({hue2}, 70%, 45%);stop-opacity:1" />
+                    </linearGradient>
+                    <pattern id="grid{hash}" width="40" height="40" patternUnits="userSpaceOnUse">
+                        <path d="M 40 0 L 0 0 0 40" fill="none" stroke="rgba(255,255,255,0.1)" stroke-width="1"/>
+                    </pattern>
+                </defs>
+                <rect width="400" height="400" fill="url(#grad{hash})"/>
+                <rect width="400" height="400" fill="url(#grid{hash})"/>
+            </svg>
+        '''
+
+
+def _to_int32(value: int) -> int:
+    value &= 0xFFFFFFFF
+    return value - (1 << 32) if value >= (1 << 31) else value
+
+
+def title_hash(title: str) -> int:
+    """The JS `(acc << 5) - acc` string hash, over UTF-16 code units."""
+    units = title.encode('utf-16-le')
+    acc = 0
+    for i in range(0, len(units), 2):
+        code = units[i] | (units[i + 1] << 8)
+        acc = code + (_to_int32(_to_int32(acc) << 5) - acc)
+    return acc
+
+
+def generate_placeholder(entry: Dict) -> str:
+    """Same gradient data URI as `generatePlaceholder` in the page script."""
+    title = entry.get('title') or entry.get('id') or 'Project'
+    hash_value = title_hash(title)
+    hue1 = abs(hash_value) % 360
+    hue2 = (hue1 + 137) % 360
+    svg = PLACEHOLDER_SVG.format(hash=hash_value, hue1=hue1, hue2=hue2)
+    return 'data:image/svg+xml,' + quote(svg, safe="-_.!~*'()")
+
+
+def _js_split(pattern, text: str) -> List[str]:
+    # String.prototype.split never splits on an empty match right where the
+    # previous piece ended, unlike re.split
+    parts, last = [], 0
+    for match in pattern.finditer(text):
+        if match.start() == match.end() == last:
+            continue
+        parts.append(text[last:match.start()])
+        last = match.end()
+    parts.append(text[last:])
+    return parts
+
+
+def project_icon(entry: Dict) -> str:
+    categories = entry.get('categories')
+    if categories is None:
+        categories = entry.get('tags') or []
+    for category in categories:
+        icon = CATEGORY_ICONS.get(category.lower())
+        if icon:
+            return icon
+    title = entry.get('title') or entry.get('id') or 'Project'
+    words = _js_split(_WORD_BREAK, title)[:2]
+    return ''.join(word[0] for word in words if word).upper()[:2]
+
+
+def render_card(entry: Dict) -> str:
+    """One <article class="catalogue-card">, as `createCard` builds it."""
+    title = entry.get('title') or entry.get('id') or 'Untitled'
+    display_title = _CAMEL_BOUNDARY.sub(r'\1<wbr>\2', escape_text(title))
+    link = escape_attr(entry.get('demoUrl') or entry.get('githubUrl') or '')
+    github = escape_attr(entry.get('githubUrl') or '')
+    placeholder = bool(entry.get('placeholder'))
+    image = generate_placeholder(entry) if placeholder else (entry.get('thumbnail') or entry.get('screenshot') or '')
+    tags = entry.get('tags') or []
+    tags_html = ('<div class="catalogue-tags">' + ''.join(f'<span>{escape_text(tag)}</span>' for tag in tags) + '</div>'
+                 if tags else '')
+
+    return (
+        f'<article class="catalogue-card" data-demo-url="{link}" data-title="{escape_attr(title)}"'
+        f'{" data-placeholder" if placeholder else ""}>'
+        f'<a class="catalogue-card-thumb" href="{link}" target="_blank" rel="noopener noreferrer">'
+        f'<img src="{escape_attr(image)}" alt="{escape_attr(entry.get("title") or "")} screenshot" loading="lazy">'
+        f'<div class="catalogue-card-logo" style="display: {"block" if placeholder else "none"};">'
+        f'<div class="catalogue-card-logo-icon">{escape_text(project_icon(entry))}</div>'
+        f'<div class="catalogue-card-logo-text">{display_title}</div>'
+        f'</div></a>'
+        f'<div class="catalogue-card-title-wrapper"><h4 class="catalogue-card-title">{display_title}</h4></div>'
+        f'<div class="catalogue-card-body">'
+        f'<p class="catalogue-card-description">{escape_text(entry.get("oneLiner") or "")}</p>'
+        f'{tags_html}'
+        f'<div class="catalogue-links">'
+        f'<a class="demo-link" href="{link}" target="_blank" rel="noopener noreferrer">Demo</a>'
+        f'<a class="github-link" href="{github}" target="_blank" rel="noopener noreferrer">GitHub</a>'
+        f'</div></div></article>'
+    )
+
+
+def card_fields(entry: Dict) -> Dict:
+    """The subset of an entry a card needs, without unset fields.
+
+    Empty `categories` are kept: the JS only falls back to tags when the
+    field is missing, so dropping it would change the icon.
+    """
+    card = {field: entry[field] for field in CARD_FIELDS if entry.get(field) is not None}
+    if card.get('thumbnail') or card.get('placeholder'):
+        card.pop('screenshot', None)
+    return card
+
+
+def group_items(items: List[Dict]) -> Dict[str, List[Dict]]:
+    """Group entries by lower-cased kind, defaulting to 'project' (`groupItems`)."""
+    groups: Dict[str, List[Dict]] = {}
+    for item in items:
+        groups.setdefault((item.get('kind') or 'project').lower(), []).append(item)
+    return groups
+
+
+def render_grid(grid_id: str, entries: List[Dict]) -> str:
+    """The grid element plus the count line, as `renderItems(..., showCount=true)` leaves it."""
+    if not entries:
+        return (f'<div class="catalogue-grid" id="{grid_id}" data-prerendered>\n'
+                f'<div class="catalogue-empty">{EMPTY_MESSAGE}</div>\n</div>')
+    count = len(entries)
+    cards = '\n'.join(render_card(entry) for entry in entries)
+    return (f'<div class="catalogue-grid" id="{grid_id}" data-prerendered>\n{cards}\n</div>\n'
+            f'<div class="catalogue-count">Showing {count} project{"s" if count != 1 else ""}</div>')
+
+
+def render_catalogue_sections(items: List[Dict]) -> Dict[str, str]:
+    groups = group_items(items)
+    return {name: render_grid(grid_id, groups.get(kind, [])) for name, (grid_id, kind) in CATALOGUE_GRIDS.items()}
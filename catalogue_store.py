@@ -0,0 +1,228 @@
+"""
+Shared reader/writer for catalogue_data.json.
+
+Every script that edits the catalogue goes through `CatalogueStore` (or the
+lower-level `load_catalogue` / `save_catalogue`). Writes stream to a
+temporary file in the same directory and atomically replace the original,
+so a crash never leaves a truncated catalogue behind. A write whose content
+(ignoring `generatedAt`) matches what is already on disk is skipped, so an
+unchanged run produces no commit and no Pages redeploy.
+
+Alongside the full file, every save keeps compact per-kind shards under
+catalogue/ up to date: `<kind>.<hash>.json` files holding only the fields
+the cards render, plus a small catalogue/manifest.json naming the current
+shard for each kind. Shard names change only when their content does, so
+each grid's data caches independently.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from catalogue_cards import card_fields, group_items
+
+CATALOGUE_FILE = 'catalogue_data.json'
+SHARD_DIR = 'catalogue'
+MANIFEST_NAME = 'manifest.json'
+# Where an entry came from: built from a GitHub repo, added by hand, or
+# fetched from the public deployment of a private repo
+SOURCES = ('github', 'manual', 'private-deployment')
+
+
+def load_catalogue(path: str = CATALOGUE_FILE) -> Dict:
+    """Return the catalogue payload, or an empty one if the file is missing."""
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            data = json.load(fh)
+    except FileNotFoundError:
+        return {'items': []}
+    data.setdefault('items', [])
+    return data
+
+
+def content_hash(payload: Dict) -> str:
+    """Hash of the catalogue content, ignoring the generatedAt timestamp."""
+    content = {key: value for key, value in payload.items() if key != 'generatedAt'}
+    encoded = json.dumps(content, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def save_catalogue(payload: Dict, path: str = CATALOGUE_FILE) -> bool:
+    """Write the catalogue if its content changed; returns True if written.
+
+    `generatedAt` is refreshed only when something else changed.
+    """
+    write_catalogue_shards(payload, os.path.join(os.path.dirname(path), SHARD_DIR))
+    if os.path.exists(path):
+        try:
+            if content_hash(load_catalogue(path)) == content_hash(payload):
+                print(f"✓ {path} unchanged - not rewriting")
+                return False
+        except (OSError, json.JSONDecodeError):
+            pass
+
+    document = {'generatedAt': datetime.now(timezone.utc).isoformat()}
+    document.update((key, value) for key, value in payload.items() if key != 'generatedAt')
+    payload['generatedAt'] = document['generatedAt']
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.catalogue-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            for chunk in json.JSONEncoder(indent=2).iterencode(document):
+                fh.write(chunk)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def _write_if_changed(path: str, content: str) -> bool:
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            if fh.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    fd, tmp_path = tempfile.mkstemp(prefix='.catalogue-', suffix='.tmp', dir=os.path.dirname(path) or '.')
+    with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+        fh.write(content)
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_catalogue_shards(payload: Dict, shard_dir: str = SHARD_DIR) -> Dict:
+    """Write minified per-kind shards and their manifest; returns the manifest.
+
+    Shards no longer named by the manifest are deleted.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    manifest = {'shards': {}, 'counts': {}}
+    for kind, entries in sorted(group_items(payload.get('items', [])).items()):
+        shard = json.dumps({'kind': kind, 'items': [card_fields(entry) for entry in entries]},
+                           separators=(',', ':'), ensure_ascii=False)
+        digest = hashlib.sha256(shard.encode('utf-8')).hexdigest()[:12]
+        name = f'{kind}.{digest}.json'
+        _write_if_changed(os.path.join(shard_dir, name), shard)
+        manifest['shards'][kind] = f'{SHARD_DIR}/{name}'
+        manifest['counts'][kind] = len(entries)
+
+    _write_if_changed(os.path.join(shard_dir, MANIFEST_NAME),
+                      json.dumps(manifest, separators=(',', ':'), sort_keys=True))
+    current = {os.path.basename(url) for url in manifest['shards'].values()}
+    for path in glob.glob(os.path.join(shard_dir, '*.*.json')):
+        if os.path.basename(path) not in current:
+            os.remove(path)
+    return manifest
+
+
+class CatalogueStore:
+    """catalogue_data.json held as an insertion-ordered dict keyed by id.
+
+    Each entry records where it came from in its `source` field (one of
+    SOURCES). Use as a context manager to load once, apply any number of
+    changes and save once:
+
+        with CatalogueStore.open() as store:
+            store.upsert(entry, source='manual')
+    """
+
+    def __init__(self, payload: Dict, path: str = CATALOGUE_FILE):
+        self.path = path
+        self.extra = {key: value for key, value in payload.items() if key != 'items'}
+        self._entries: Dict[str, Dict] = {}
+        for item in payload.get('items', []):
+            self._entries[item.get('id')] = item
+
+    @classmethod
+    def open(cls, path: str = CATALOGUE_FILE) -> 'CatalogueStore':
+        return cls(load_catalogue(path), path)
+
+    def __enter__(self) -> 'CatalogueStore':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+
+    def __contains__(self, entry_id: str) -> bool:
+        return entry_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def items(self) -> List[Dict]:
+        return list(self._entries.values())
+
+    def get(self, entry_id: str) -> Optional[Dict]:
+        return self._entries.get(entry_id)
+
+    def by_source(self, source: str) -> List[Dict]:
+        return [entry for entry in self._entries.values() if entry.get('source') == source]
+
+    def upsert(self, entry: Dict, source: Optional[str] = None) -> bool:
+        """Insert or replace an entry by id; returns True if it was new.
+
+        A replaced entry keeps its position in the catalogue.
+        """
+        if source:
+            entry['source'] = source
+        is_new = entry['id'] not in self._entries
+        self._entries[entry['id']] = entry
+        return is_new
+
+    def delete(self, entry_id: str) -> bool:
+        return self._entries.pop(entry_id, None) is not None
+
+    def patch(self, entry_id: str, **fields) -> Optional[Dict]:
+        """Update some fields of an existing entry; returns it, or None if absent."""
+        entry = self._entries.get(entry_id)
+        if entry is not None:
+            entry.update(fields)
+        return entry
+
+    def replace_source(self, entries: List[Dict], source: str) -> Tuple[int, int]:
+        """Make `entries` the complete set for `source`, in one linear pass.
+
+        The new entries come first, in the given order, followed by every
+        entry from other sources. Entries without a `source` (written before
+        provenance was tracked) count as manual, so an id clash with the
+        new entries is resolved in favour of the new ones. Returns
+        (kept_from_other_sources, dropped_from_source).
+        """
+        new_entries = {}
+        for entry in entries:
+            entry['source'] = source
+            new_entries[entry['id']] = entry
+        kept = dropped = 0
+        for entry_id, entry in self._entries.items():
+            if entry_id in new_entries:
+                continue
+            if entry.get('source') == source:
+                dropped += 1
+                continue
+            new_entries[entry_id] = entry
+            kept += 1
+        self._entries = new_entries
+        return kept, dropped
+
+    def to_payload(self) -> Dict:
+        return dict(self.extra, items=self.items)
+
+    def save(self) -> bool:
+        """Write the catalogue if it changed; returns True if written."""
+        payload = self.to_payload()
+        written = save_catalogue(payload, self.path)
+        if written:
+            self.extra['generatedAt'] = payload['generatedAt']
+        return written
@@ -6,9 +6,13 @@ Run this to see which private repos need setup.
 
 import requests
 import os
+import sys
 import json
 from typing import List, Dict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from github_api import GITHUB_API, create_session, print_cache_summary
+
 GITHUB_USERNAME = 'kylemath'
 CATALOGUE_ENTRY_FILE = 'catalogue.json'
 
@@ -29,17 +33,14 @@ def check_private_repos():
     print("CHECKING PRIVATE REPOSITORIES")
     print("=" * 80)
     
-    headers = {
-        'Accept': 'application/vnd.github.mercy-preview+json',
-        'Authorization': f'token {token}'
-    }
+    session = create_session(token, accept='application/vnd.github.mercy-preview+json')
     
     # Fetch all repos
     repos = []
     page = 1
     while True:
-        url = f'https://api.github.com/users/{GITHUB_USERNAME}/repos?page={page}&per_page=100'
-        response = requests.get(url, headers=headers)
+        url = f'{GITHUB_API}/users/{GITHUB_USERNAME}/repos?page={page}&per_page=100'
+        response = session.get(url)
         if response.status_code != 200:
             print(f"❌ GitHub API error: {response.status_code}")
             if response.status_code == 401:
@@ -94,7 +95,7 @@ def check_private_repos():
         
         for url in catalogue_urls:
             try:
-                response = requests.get(url, timeout=5)
+                response = session.get(url, timeout=5)
                 if response.status_code == 200:
                     catalogue_data = json.loads(response.text)
                     catalogue_found = True
@@ -134,7 +135,7 @@ def check_private_repos():
                     screenshot_url = f"{homepage}/{screenshot.lstrip('./')}"
                 
                 try:
-                    resp = requests.head(screenshot_url, timeout=5)
+                    resp = session.head(screenshot_url, timeout=5)
                     if resp.status_code == 200:
                         print(f"   ✅ Screenshot: {screenshot_url}")
                     else:
@@ -168,6 +169,7 @@ def check_private_repos():
         print("   python update_projects.py")
     
     print("=" * 80)
+    print_cache_summary(session)
 
 if __name__ == '__main__':
     check_private_repos()
@@ -4,9 +4,13 @@ Quick fix: Update the Juventus screenshot URL in catalogue_data.json
 This fixes the incorrect GitHub raw URL to use the public Netlify URL instead.
 """
 
-import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from catalogue_store import CatalogueStore
+from render_site import render_index
 
-CATALOGUE_FILE = 'catalogue_data.json'
 JUVENTUS_ID = 'juventus2013teamsite'
 CORRECT_SCREENSHOT_URL = 'https://juventus2013.netlify.app/screenshot.png'
 
@@ -14,30 +18,30 @@ def fix_juventus_screenshot():
     """Fix the Juventus screenshot URL."""
     
     print("Reading catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    items = data.get('items', [])
-    found = False
+    store = CatalogueStore.open()
+    item = store.get(JUVENTUS_ID)
     
-    for item in items:
-        if item.get('id') == JUVENTUS_ID:
-            old_url = item.get('screenshot')
-            item['screenshot'] = CORRECT_SCREENSHOT_URL
-            found = True
-            print(f"\n✅ Found Juventus entry!")
-            print(f"   Old URL: {old_url}")
-            print(f"   New URL: {CORRECT_SCREENSHOT_URL}")
-            break
-    
-    if not found:
+    if item is None:
         print(f"\n❌ Juventus entry not found in catalogue_data.json")
         print(f"   Looking for ID: {JUVENTUS_ID}")
         return
     
+    print(f"\n✅ Found Juventus entry!")
+    print(f"   Old URL: {item.get('screenshot')}")
+    print(f"   New URL: {CORRECT_SCREENSHOT_URL}")
+    if item.get('screenshot') != CORRECT_SCREENSHOT_URL:
+        # The thumbnail and placeholder flag describe the old image; the next
+        # build_thumbnails/validate_screenshots run fills them in again
+        item.pop('thumbnail', None)
+        item.pop('placeholder', None)
+    store.patch(JUVENTUS_ID, screenshot=CORRECT_SCREENSHOT_URL)
+    
     print("\nWriting updated catalogue_data.json...")
-    with open(CATALOGUE_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+    if store.save():
+        # The catalogue grids in index.html are prerendered from the catalogue
+        render_index()
+    else:
+        print("   Screenshot URL was already correct - nothing to write")
     
     print("✅ Done! The screenshot URL has been fixed.")
     print("\nThe fix is temporary. To prevent this issue:")
@@ -0,0 +1,418 @@
+"""
+Shared HTTP plumbing for the scripts that talk to the GitHub API.
+
+All updaters should create one session per run with `create_session` and
+pass it down, so connections are pooled and reused across requests.
+
+GET responses carrying an ETag or Last-Modified header are kept in an
+on-disk cache and revalidated with If-None-Match / If-Modified-Since on the
+next run. GitHub answers an unchanged resource with 304, which does not
+count against the rate limit.
+
+A session never has more than `max_per_host` requests in flight to one host,
+however many worker threads share it, so a large pool cannot burst past
+GitHub's secondary (concurrency) rate limits.
+
+API responses feed a RateLimiter that tracks X-RateLimit-Remaining/Reset per
+resource. Once the budget runs low, requests are spread over the rest of the
+window. Idempotent GETs that hit a 403/429 rate limit, a 5xx or a dropped
+connection are retried with jittered exponential backoff, honouring
+Retry-After. `print_rate_limit_summary` reports what a run cost.
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from build_state import CACHE_DIR
+
+GITHUB_API = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+GITHUB_GRAPHQL = f'{GITHUB_API}/graphql'
+DEFAULT_WORKERS = int(os.getenv('GITHUB_WORKERS', '8'))
+# Concurrent requests one session allows per host, whatever the pool size
+MAX_REQUESTS_PER_HOST = int(os.getenv('GITHUB_MAX_PER_HOST', '8'))
+# Retries for idempotent API requests, and the backoff between them (seconds)
+MAX_RETRIES = int(os.getenv('GITHUB_MAX_RETRIES', '4'))
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+# Below this many remaining requests, pace the rest evenly until the reset
+RATE_LIMIT_RESERVE = int(os.getenv('GITHUB_RATE_LIMIT_RESERVE', '100'))
+# Never sleep longer than this for a reset or Retry-After; fail instead
+RATE_LIMIT_MAX_WAIT = float(os.getenv('GITHUB_RATE_LIMIT_MAX_WAIT', '900'))
+RETRY_METHODS = {'GET', 'HEAD'}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, 'http')
+HTTP_CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+HTTP_CACHE_ENABLED = os.getenv('HTTP_CACHE', '1') != '0'
+
+# Headers that describe the wire encoding rather than the cached body
+_TRANSPORT_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+
+class ResponseCache:
+    """Size-bounded on-disk store of GET bodies and their validators.
+
+    Each entry is a `<key>.json` metadata file plus a `<key>.body` file.
+    When the total size exceeds `max_bytes` the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, directory: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = {'revalidated': 0, 'stored': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._sizes: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    def key(url: str, headers: Dict[str, str]) -> str:
+        """Cache key for a URL and Accept header, split by anonymous/authenticated.
+
+        The token itself is left out because the Actions GITHUB_TOKEN changes
+        every run; the server still checks the ETag against what this caller
+        is allowed to see.
+        """
+        vary = '\n'.join([url, headers.get('Accept', ''), 'auth' if 'Authorization' in headers else 'anon'])
+        return hashlib.sha256(vary.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.directory, key)
+        return f'{base}.json', f'{base}.body'
+
+    def get(self, key: str) -> Optional[Tuple[Dict, bytes]]:
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as fh:
+                meta = json.load(fh)
+            with open(body_path, 'rb') as fh:
+                body = fh.read()
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta, body
+
+    def touch(self, key: str):
+        """Mark an entry as recently used after a successful revalidation."""
+        for path in self._paths(key):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        with self._lock:
+            self.stats['revalidated'] += 1
+
+    def put(self, key: str, response: requests.Response):
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _TRANSPORT_HEADERS}
+        meta = {
+            'url': response.url,
+            'status': response.status_code,
+            'encoding': response.encoding,
+            'headers': headers,
+        }
+        meta_bytes = json.dumps(meta).encode('utf-8')
+        body = response.content
+
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path, body_path = self._paths(key)
+        for path, data in ((body_path, body), (meta_path, meta_bytes)):
+            tmp_path = f'{path}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+
+        with self._lock:
+            sizes = self._load_sizes()
+            sizes[key] = len(meta_bytes) + len(body)
+            self.stats['stored'] += 1
+            if sum(sizes.values()) > self.max_bytes:
+                self._evict(sizes)
+
+    def _load_sizes(self) -> Dict[str, int]:
+        if self._sizes is None:
+            self._sizes = {}
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith('.tmp'):
+                        continue
+                    key = name.rsplit('.', 1)[0]
+                    try:
+                        size = os.path.getsize(os.path.join(self.directory, name))
+                    except OSError:
+                        continue
+                    self._sizes[key] = self._sizes.get(key, 0) + size
+        return self._sizes
+
+    def _evict(self, sizes: Dict[str, int]):
+        """Drop least recently used entries until under 90% of the budget."""
+        def last_used(key):
+            try:
+                return os.path.getmtime(self._paths(key)[0])
+            except OSError:
+                return 0
+        total = sum(sizes.values())
+        for key in sorted(sizes, key=last_used):
+            if total <= self.max_bytes * 0.9:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= sizes.pop(key)
+            self.stats['evicted'] += 1
+
+
+class RateLimiter:
+    """Per-session view of the GitHub rate-limit budget.
+
+    Remaining/reset are read from every API response, keyed by the
+    X-RateLimit-Resource they apply to (core, graphql, search). `pace`
+    returns how long to wait before the next request and `backoff` how long
+    to wait before retrying a failed one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.budgets: Dict[str, Dict[str, int]] = {}
+        self.stats = {'requests': 0, 'charged': 0, 'retries': 0, 'waited': 0.0}
+
+    @staticmethod
+    def resource(url: str) -> str:
+        if url.startswith(GITHUB_GRAPHQL):
+            return 'graphql'
+        if url.startswith(f'{GITHUB_API}/search/'):
+            return 'search'
+        return 'core'
+
+    def update(self, url: str, response: requests.Response):
+        headers = response.headers
+        resource = headers.get('X-RateLimit-Resource') or self.resource(url)
+        with self._lock:
+            self.stats['requests'] += 1
+            # Conditional requests answered with 304 don't count against the limit
+            if response.status_code != 304:
+                self.stats['charged'] += 1
+            if 'X-RateLimit-Remaining' not in headers:
+                return
+            try:
+                budget = {name: int(headers[f'X-RateLimit-{name.title()}'])
+                          for name in ('limit', 'remaining', 'reset') if f'X-RateLimit-{name.title()}' in headers}
+            except ValueError:
+                return
+            first = self.budgets.get(resource, {}).get('first_remaining', budget['remaining'])
+            self.budgets[resource] = dict(budget, first_remaining=first)
+
+    def pace(self, url: str) -> float:
+        """Seconds to wait so the remaining budget lasts until the reset."""
+        with self._lock:
+            budget = self.budgets.get(self.resource(url))
+        if not budget or 'reset' not in budget or budget['remaining'] >= RATE_LIMIT_RESERVE:
+            return 0.0
+        window = budget['reset'] - time.time()
+        if window <= 0:
+            return 0.0
+        if budget['remaining'] <= 0:
+            return window + 1
+        return window / budget['remaining']
+
+    def backoff(self, response: Optional[requests.Response], attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the failure is final."""
+        if response is not None:
+            status = response.status_code
+            rate_limited = status == 403 and (response.headers.get('X-RateLimit-Remaining') == '0'
+                                              or 'Retry-After' in response.headers
+                                              or 'rate limit' in response.text.lower())
+            if status not in RETRY_STATUSES and not rate_limited:
+                return None
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return int(retry_after) + random.uniform(0, 1)
+            if response.headers.get('X-RateLimit-Remaining') == '0' and 'X-RateLimit-Reset' in response.headers:
+                return max(int(response.headers['X-RateLimit-Reset']) - time.time(), 0) + random.uniform(1, 2)
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def wait(self, seconds: float, retry: bool = False):
+        with self._lock:
+            self.stats['waited'] += seconds
+            if retry:
+                self.stats['retries'] += 1
+        time.sleep(seconds)
+
+
+class GitHubSession(requests.Session):
+    """requests.Session that scopes GitHub credentials to the API host and
+    revalidates GET responses against a ResponseCache."""
+
+    def __init__(self, api_headers: Optional[Dict[str, str]] = None,
+                 cache: Optional[ResponseCache] = None,
+                 max_per_host: int = MAX_REQUESTS_PER_HOST):
+        super().__init__()
+        self.api_headers = api_headers or {}
+        self.cache = cache
+        self.max_per_host = max(1, max_per_host)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self.rate_limiter = RateLimiter()
+
+    def host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """The semaphore bounding in-flight requests to the URL's host."""
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+        return slot
+
+    def request(self, method, url, headers=None, **kwargs):
+        with self.host_slot(url):
+            return self._request(method, url, headers, **kwargs)
+
+    def _request(self, method, url, headers=None, **kwargs):
+        headers = dict(headers or {})
+        # Never leak the token to homepages or raw.githubusercontent.com
+        if url.startswith(GITHUB_API):
+            for name, value in self.api_headers.items():
+                headers.setdefault(name, value)
+
+        if method.upper() != 'GET' or self.cache is None or kwargs.get('stream'):
+            return self._send(method, url, headers, **kwargs)
+
+        key = self.cache.key(requests.Request('GET', url, params=kwargs.get('params')).prepare().url, headers)
+        cached = self.cache.get(key)
+        if cached:
+            meta_headers = CaseInsensitiveDict(cached[0]['headers'])
+            if 'ETag' in meta_headers:
+                headers['If-None-Match'] = meta_headers['ETag']
+            if 'Last-Modified' in meta_headers:
+                headers['If-Modified-Since'] = meta_headers['Last-Modified']
+
+        response = self._send(method, url, headers, **kwargs)
+
+        if response.status_code == 304 and cached:
+            self.cache.touch(key)
+            return _cached_response(response, *cached)
+        if response.status_code == 200 and ('ETag' in response.headers or 'Last-Modified' in response.headers):
+            self.cache.put(key, response)
+        return response
+
+    def _send(self, method, url, headers, **kwargs):
+        """Issue one request, pacing API calls and retrying idempotent ones."""
+        if not url.startswith(GITHUB_API):
+            return super().request(method, url, headers=headers, **kwargs)
+
+        limiter = self.rate_limiter
+        retries = MAX_RETRIES if method.upper() in RETRY_METHODS else 0
+        attempt = 0
+        while True:
+            delay = limiter.pace(url)
+            if delay > RATE_LIMIT_MAX_WAIT:
+                raise RuntimeError(f"GitHub rate limit exhausted; resets in {delay:.0f}s")
+            if delay > 0:
+                limiter.wait(delay)
+            try:
+                response = super().request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= retries:
+                    raise
+                response = None
+            else:
+                limiter.update(url, response)
+                if attempt >= retries:
+                    return response
+
+            delay = limiter.backoff(response, attempt)
+            if delay is None or delay > RATE_LIMIT_MAX_WAIT:
+                return response
+            status = response.status_code if response is not None else 'connection error'
+            if response is not None:
+                response.close()
+            print(f"⏳ GitHub API {status} for {urlsplit(url).path} - retrying in {delay:.1f}s")
+            limiter.wait(delay, retry=True)
+            attempt += 1
+
+
+def _cached_response(not_modified: requests.Response, meta: Dict, body: bytes) -> requests.Response:
+    """Rebuild the stored response, keeping the fresh headers from the 304."""
+    response = requests.Response()
+    response.status_code = meta['status']
+    response.headers = CaseInsensitiveDict(meta['headers'])
+    response.headers.update({k: v for k, v in not_modified.headers.items()
+                             if k.lower() not in _TRANSPORT_HEADERS})
+    response._content = body
+    response.encoding = meta.get('encoding')
+    response.url = meta.get('url') or not_modified.url
+    response.request = not_modified.request
+    response.reason = 'OK (revalidated)'
+    response.from_cache = True
+    return response
+
+
+_shared_cache: Optional[ResponseCache] = None
+
+
+def shared_cache() -> ResponseCache:
+    """The process-wide response cache, so every session shares one size budget."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
+
+
+def create_session(token: Optional[str] = None,
+                   accept: Optional[str] = None,
+                   pool_size: int = DEFAULT_WORKERS,
+                   cache: bool = HTTP_CACHE_ENABLED,
+                   max_per_host: int = MAX_REQUESTS_PER_HOST) -> GitHubSession:
+    """Return a session with GitHub auth headers and a connection pool
+    large enough for `pool_size` concurrent workers.
+
+    At most `max_per_host` requests per host run at once (GITHUB_MAX_PER_HOST).
+    Set HTTP_CACHE=0 to disable conditional-request caching.
+    """
+    api_headers = {}
+    if accept:
+        api_headers['Accept'] = accept
+    if token:
+        api_headers['Authorization'] = f'token {token}'
+    session = GitHubSession(api_headers, shared_cache() if cache else None, max_per_host)
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def print_rate_limit_summary(session: requests.Session, label: str = 'GitHub API'):
+    """Print the requests a session made, what they cost and the budget left."""
+    limiter = getattr(session, 'rate_limiter', None)
+    if limiter is None:
+        return
+    stats = limiter.stats
+    line = (f"{label}: {stats['requests']} requests ({stats['charged']} counted against the limit), "
+            f"{stats['retries']} retries, {stats['waited']:.1f}s waiting")
+    for resource, budget in sorted(limiter.budgets.items()):
+        used = budget['first_remaining'] - budget['remaining']
+        line += f"; {resource} {budget['remaining']}/{budget.get('limit', '?')} left"
+        if used > 0:
+            line += f" (used {used})"
+    print(line)
+
+
+def print_cache_summary(session: requests.Session):
+    """Print how many requests were answered from the HTTP cache."""
+    cache = getattr(session, 'cache', None)
+    if cache is None:
+        return
+    stats = cache.stats
+    print(f"HTTP cache: {stats['revalidated']} not modified (304), "
+          f"{stats['stored']} downloaded and stored, {stats['evicted']} evicted")
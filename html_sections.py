@@ -0,0 +1,53 @@
+"""
+Shared HTML helpers for the generated sections of index.html.
+
+Each generated block in the page is wrapped in a pair of comments:
+
+    <!-- section:projects -->
+    <ul>
+        ...
+    </ul>
+    <!-- /section:projects -->
+
+render_site.py fills those slots from templates/index.html and the data
+files; this module holds the marker format, the escaping and list helpers
+the section renderers share, and `write_atomic` for the page and data
+writers.
+"""
+
+import html
+import os
+import tempfile
+from typing import List
+
+BEGIN_MARKER = '<!-- section:{name} -->'
+END_MARKER = '<!-- /section:{name} -->'
+
+
+def escape_text(value: str) -> str:
+    """Escape text content the way BeautifulSoup's minimal formatter does."""
+    return html.escape(value, quote=False)
+
+
+def escape_attr(value: str) -> str:
+    return html.escape(value, quote=True)
+
+
+def write_atomic(path: str, content: str):
+    """Write text to `path` via a temp file and rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.html-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def render_list(items: List[str], tag: str = 'ul') -> str:
+    """Wrap pre-rendered <li> strings in a list element, one per line."""
+    closing = tag.split()[0]
+    return f'<{tag}>\n' + ''.join(f'    {item}\n' for item in items) + f'</{closing}>'
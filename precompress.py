@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Write gzip and brotli variants next to every generated site file.
+
+For a preview server or CDN that serves precompressed files, index.html is
+accompanied by index.html.gz and index.html.br, and likewise for the
+catalogue JSON. Output is deterministic (no timestamps in the gzip header),
+and a file whose content hash matches the last run keeps its existing
+compressed variants. Per-file before/after byte counts are printed so size
+regressions show up in the build log.
+
+Usage:
+    python precompress.py [files...]
+
+Without arguments the generated artifacts (GENERATED_FILES) are compressed.
+Brotli output needs the `brotli` package (pip install Brotli); without it
+only .gz files are written.
+"""
+
+import glob
+import gzip
+import hashlib
+import os
+import sys
+from typing import Dict, List, Optional
+
+from build_state import CACHE_DIR, load_json_state, save_json_state
+from catalogue_store import CATALOGUE_FILE, SHARD_DIR
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRECOMPRESS_INDEX_FILE = os.path.join(CACHE_DIR, 'precompress_index.json')
+GENERATED_FILES = ['index.html', CATALOGUE_FILE, os.path.join(SHARD_DIR, '*.json')]
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def generated_files(patterns: List[str]) -> List[str]:
+    files = []
+    for pattern in patterns:
+        files.extend(sorted(glob.glob(pattern)))
+    return files
+
+
+def write_bytes(path: str, data: bytes):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
+
+
+def compress_file(path: str, previous: Optional[Dict]) -> Dict:
+    """Write path.gz (and path.br) unless the content is unchanged; returns the index record."""
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    record = {'sha256': hashlib.sha256(data).hexdigest(), 'size': len(data), 'reused': False}
+
+    variants = {'gz': path + '.gz'}
+    if brotli is not None:
+        variants['br'] = path + '.br'
+    if (previous and previous.get('sha256') == record['sha256']
+            and all(os.path.exists(variant) for variant in variants.values())):
+        record.update({ext: os.path.getsize(variant) for ext, variant in variants.items()}, reused=True)
+        return record
+
+    gz = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    write_bytes(variants['gz'], gz)
+    record['gz'] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=BROTLI_QUALITY)
+        write_bytes(variants['br'], br)
+        record['br'] = len(br)
+    return record
+
+
+def remove_orphans(patterns: List[str]) -> int:
+    """Delete .gz/.br files whose original no longer exists (e.g. old shards)."""
+    removed = 0
+    for pattern in patterns:
+        for ext in ('.gz', '.br'):
+            for variant in glob.glob(pattern + ext):
+                if not os.path.exists(variant[:-len(ext)]):
+                    os.remove(variant)
+                    removed += 1
+    return removed
+
+
+def ratio(size: Optional[int], original: int) -> str:
+    if size is None:
+        return '-'
+    return f"{size:>9,} B ({size / original:5.1%})" if original else f"{size:>9,} B"
+
+
+def precompress(patterns: List[str] = GENERATED_FILES) -> Dict[str, Dict]:
+    """Compress every file matching `patterns`; returns {path: record}."""
+    if brotli is None:
+        print("⚠️  brotli not installed - writing .gz only. Install with: pip install Brotli")
+
+    previous_index = load_json_state(PRECOMPRESS_INDEX_FILE)
+    index = {}
+    for path in generated_files(patterns):
+        index[path] = compress_file(path, previous_index.get(path))
+    removed = remove_orphans(patterns)
+    save_json_state(PRECOMPRESS_INDEX_FILE, index)
+
+    print(f"{'file':<40} {'original':>11}  {'gzip':>19}  {'brotli':>19}")
+    for path, record in index.items():
+        print(f"{path:<40} {record['size']:>9,} B  {ratio(record.get('gz'), record['size'])}  "
+              f"{ratio(record.get('br'), record['size'])}{'  (reused)' if record['reused'] else ''}")
+    total = sum(record['size'] for record in index.values())
+    total_gz = sum(record.get('gz', 0) for record in index.values())
+    reused = sum(record['reused'] for record in index.values())
+    summary = f"🗜️  {len(index)} files, {total:,} B → {total_gz:,} B gzip"
+    if brotli is not None:
+        summary += f", {sum(record.get('br', 0) for record in index.values()):,} B brotli"
+    print(f"{summary} ({reused} reused, {removed} orphaned variants removed)")
+    return index
+
+
+if __name__ == '__main__':
+    precompress(sys.argv[1:] or GENERATED_FILES)
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Google Scholar publications: fetch, store and render.
+
+A backend fetches pages of the author's Scholar profile: RequestsBackend
+with plain `requests`, ScholarlyBackend through the scholarly library's
+Navigator, which handles proxies and captchas. Rows from either are parsed
+by scholar_extract (lxml, precompiled XPath) and merged into an id-keyed
+store, publications_data.json, keyed by the `citation_for_view` id from
+each publication's Scholar link. Each row carries the venue and citation
+count as well, so neither needs a per-publication detail request. The
+Publications section (data/publications.json) is rendered from the store,
+so it can be rebuilt without fetching anything; PUBLICATIONS_SORT=citations
+orders it by citation count and PUBLICATIONS_MIN_CITATIONS hides
+less-cited publications.
+
+Syncs are incremental: the profile is read newest first (sortby=pubdate)
+and paging stops after KNOWN_RUN_TO_STOP publications in a row that are
+already stored. Every FULL_SYNC_INTERVAL (or with --full-sync) every page
+is walked in Scholar's default order instead. That refreshes stored
+details, restores the within-year order and drops publications removed
+from the profile.
+
+Parsing is local and never sleeps; the only politeness delay is PAGE_DELAY
+between page requests. Per-row progress is logged at DEBUG level (run with
+LOG_LEVEL=DEBUG to see it).
+
+Usage:
+    python publications.py [--scholarly] [--full-sync]  # fetch, merge, render
+    python publications.py --render                     # re-render from the store only
+    PUBLICATIONS_SORT=citations PUBLICATIONS_MIN_CITATIONS=10 python publications.py --render
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+from urllib.parse import parse_qs, urlsplit
+
+from html_sections import escape_attr, escape_text, write_atomic
+from render_site import HTML_FILE, render_index, save_section_data
+from scholar_extract import extract_rows
+
+SCHOLAR_URL = 'https://scholar.google.com'
+SCHOLAR_AUTHOR_ID = 'wgK6LCYAAAAJ'
+PUBLICATIONS_STORE_FILE = 'publications_data.json'
+PAGE_SIZE = 100  # Maximum publications per page
+PAGE_DELAY = 2  # Seconds between page requests, to be respectful
+# Incremental syncs read short newest-first pages and stop after this many
+# already-stored publications in a row
+INCREMENTAL_PAGE_SIZE = 20
+KNOWN_RUN_TO_STOP = 5
+FULL_SYNC_INTERVAL = timedelta(days=float(os.getenv('PUBLICATIONS_FULL_SYNC_DAYS', '90')))
+# Guard against replacing a good list with a truncated scrape (Kyle has ~102)
+MIN_PUBLICATIONS = 50
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+# Fields kept for each publication in the store
+STORE_FIELDS = ('id', 'title', 'url', 'authors', 'first_author', 'year', 'venue', 'citations')
+# Rendered order ('year' or 'citations') and the citation count a publication needs to be listed
+SORT_ORDERS = ('year', 'citations')
+PUBLICATIONS_SORT = os.getenv('PUBLICATIONS_SORT', 'year')
+MIN_CITATIONS = int(os.getenv('PUBLICATIONS_MIN_CITATIONS', '0'))
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging():
+    """Plain-message logging at LOG_LEVEL (default INFO) for the command-line entry points."""
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
+
+
+def parse_first_author(authors_string):
+    """Parse authors string to extract first author and add 'et al.' if multiple authors."""
+    if not authors_string or authors_string == 'Unknown Authors':
+        return 'Unknown Authors'
+
+    # Split by common separators
+    authors = re.split(r'[,;&]|\sand\s', authors_string.strip())
+
+    if len(authors) == 0:
+        return 'Unknown Authors'
+
+    first_author = authors[0].strip()
+
+    # If there's more than one author, add "et al."
+    if len(authors) > 1:
+        return f"{first_author} et al."
+    else:
+        return first_author
+
+
+def citation_id(url: str) -> Optional[str]:
+    """The `citation_for_view` id from a Scholar publication link."""
+    values = parse_qs(urlsplit(url).query).get('citation_for_view')
+    return values[0] if values else None
+
+
+def publication_id(publication: Dict) -> str:
+    """Store key: the Scholar citation id, or the title for unlinked rows."""
+    return citation_id(publication.get('url') or '') or f"title:{publication['title'].strip().lower()}"
+
+
+def year_int(publication: Dict) -> int:
+    try:
+        return int(publication.get('year') or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+def citation_count(text: Optional[str]) -> Optional[int]:
+    """The 'Cited by' cell as a number: '123' or '45*' (merged) -> int, '' -> 0."""
+    if text is None:
+        return None
+    digits = re.sub(r'\D', '', text)
+    return int(digits) if digits else 0
+
+
+def citations_int(publication: Dict) -> int:
+    return publication.get('citations') or 0
+
+
+def citations_path(author_id: str, start: int, page_size: int = PAGE_SIZE, by_date: bool = False) -> str:
+    path = f"/citations?user={author_id}&hl=en&oi=ao&cstart={start}&pagesize={page_size}"
+    return path + '&sortby=pubdate' if by_date else path
+
+
+def publication_from_row(row: Dict[str, Optional[str]]) -> Dict:
+    """A publication record from one extracted profile row (see scholar_extract)."""
+    authors = row['authors'] if row['authors'] is not None else 'Unknown Authors'
+    link = row['link'] or ''
+    publication = {
+        'title': row['title'] if row['title'] is not None else 'Unknown Title',
+        'authors': authors,
+        'first_author': parse_first_author(authors),
+        'year': row['year'] if row['year'] is not None else 'Unknown Year',
+        'venue': row['venue'] or '',
+        'citations': citation_count(row['citations']),
+        'url': f"{SCHOLAR_URL}{link}" if link else ''
+    }
+    publication['id'] = publication_id(publication)
+    return publication
+
+
+def parse_publications_page(html: str) -> List[Dict]:
+    """Parse every publication row on one profile page."""
+    publications = []
+    for i, row in enumerate(extract_rows(html)):
+        try:
+            publication = publication_from_row(row)
+        except Exception as e:
+            logger.warning("Error processing publication %d: %s", i, e)
+            continue
+        publications.append(publication)
+        logger.debug("Processed: %.50s... (%s) - %s",
+                     publication['title'], publication['year'], publication['first_author'])
+    return publications
+
+
+class RequestsBackend:
+    """Fetch profile pages directly with requests."""
+
+    name = 'requests'
+
+    def __init__(self, session=None, timeout: float = 30):
+        import requests
+
+        self.http = session or requests
+        self.timeout = timeout
+
+    def fetch_page(self, path: str) -> str:
+        url = f"{SCHOLAR_URL}{path}"
+        print(f"Fetching {url}")
+        response = self.http.get(url, headers={'User-Agent': USER_AGENT}, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+
+class ScholarlyBackend:
+    """Fetch profile pages through scholarly's Navigator (proxy/captcha aware).
+
+    Raises ImportError if scholarly is not installed.
+    """
+
+    name = 'scholarly'
+
+    def __init__(self):
+        from scholarly._navigator import Navigator
+
+        self.navigator = Navigator()
+
+    def fetch_page(self, path: str) -> str:
+        print(f"Fetching {SCHOLAR_URL}{path} via scholarly")
+        # Same clean-up Navigator._get_soup applies before parsing
+        return self.navigator._get_page(f"{SCHOLAR_URL}{path}").replace('\xa0', ' ')
+
+
+def fetch_publications(backend, author_id: str = SCHOLAR_AUTHOR_ID,
+                       known_ids: Optional[Set[str]] = None) -> List[Dict]:
+    """Fetch the author's publications, most recent year first.
+
+    Without `known_ids` every page is fetched. With them, the profile is
+    read newest first and fetching stops once KNOWN_RUN_TO_STOP known
+    publications have been seen in a row; only the rows read are returned.
+    """
+    incremental = known_ids is not None
+    page_size = INCREMENTAL_PAGE_SIZE if incremental else PAGE_SIZE
+    print(f"Fetching publications for {author_id} with the {backend.name} backend "
+          f"({'incremental' if incremental else 'full'} sync)")
+    publications = []
+    start = 0
+    known_run = 0
+    while True:
+        # Be respectful: the only pause is between page requests
+        if start > 0:
+            time.sleep(PAGE_DELAY)
+        page = parse_publications_page(backend.fetch_page(citations_path(author_id, start, page_size, incremental)))
+        if not page:
+            print(f"No more publications found. Total fetched: {len(publications)}")
+            break
+        for publication in page:
+            publications.append(publication)
+            known_run = known_run + 1 if incremental and publication['id'] in known_ids else 0
+            if known_run >= KNOWN_RUN_TO_STOP:
+                break
+        if known_run >= KNOWN_RUN_TO_STOP:
+            print(f"Reached {known_run} stored publications in a row after {len(publications)} rows - stopping")
+            break
+        # Check if we should continue to next page
+        if len(page) < page_size:
+            print(f"Reached last page. Total publications: {len(publications)}")
+            break
+        start += page_size
+
+    # Sort publications by year (most recent first)
+    publications.sort(key=year_int, reverse=True)
+    return publications
+
+
+def print_preview(publications: List[Dict], count: int = 10):
+    print(f"\nFetched and sorted {len(publications)} total publications:")
+    for i, pub in enumerate(publications[:count], 1):
+        print(f"{i}. {pub['title']} ({pub['year']}) - {pub['first_author']}")
+    if len(publications) > count:
+        print(f"... and {len(publications) - count} more")
+
+
+class PublicationStore:
+    """publications_data.json held as a dict of publications keyed by id.
+
+    The order of the dict is the order publications were last seen on the
+    profile; `sorted()` gives the rendered order (most recent year first,
+    profile order within a year).
+    """
+
+    def __init__(self, payload: Dict, path: str = PUBLICATIONS_STORE_FILE):
+        self.path = path
+        self.updated_at = payload.get('updatedAt')
+        self.last_full_sync = payload.get('lastFullSync')
+        self._publications: Dict[str, Dict] = dict(payload.get('publications', {}))
+
+    @classmethod
+    def open(cls, path: str = PUBLICATIONS_STORE_FILE) -> 'PublicationStore':
+        try:
+            with open(path, 'r', encoding='utf-8') as fh:
+                return cls(json.load(fh), path)
+        except FileNotFoundError:
+            return cls({}, path)
+
+    def __len__(self) -> int:
+        return len(self._publications)
+
+    def __contains__(self, publication_id: str) -> bool:
+        return publication_id in self._publications
+
+    def get(self, publication_id: str) -> Optional[Dict]:
+        return self._publications.get(publication_id)
+
+    def ids(self) -> Set[str]:
+        return set(self._publications)
+
+    def needs_full_sync(self) -> bool:
+        """True if the profile hasn't been walked in full within FULL_SYNC_INTERVAL."""
+        if not self.last_full_sync or not self._publications:
+            return True
+        return datetime.now(timezone.utc) - datetime.fromisoformat(self.last_full_sync) >= FULL_SYNC_INTERVAL
+
+    def merge(self, publications: List[Dict], complete: bool = False) -> Dict[str, int]:
+        """Insert or update fetched publications; returns added/updated/removed counts.
+
+        A partial (incremental) fetch updates stored publications in place
+        and appends new ones. A `complete` fetch is the whole profile: the
+        store takes its order and publications it didn't return are removed.
+        """
+        counts = {'added': 0, 'updated': 0, 'removed': 0}
+        merged: Dict[str, Dict] = {} if complete else dict(self._publications)
+        for publication in publications:
+            record = {field: publication[field] for field in STORE_FIELDS if publication.get(field) is not None}
+            previous = self._publications.get(record['id'])
+            if previous is None:
+                counts['added'] += 1
+            elif previous != record:
+                counts['updated'] += 1
+            merged[record['id']] = record
+        if complete:
+            counts['removed'] = len(set(self._publications) - set(merged))
+            self.last_full_sync = datetime.now(timezone.utc).isoformat()
+        self._publications = merged
+        return counts
+
+    def sorted(self, by: str = 'year', min_citations: int = 0) -> List[Dict]:
+        """Publications with at least `min_citations`, most recent year or most cited first.
+
+        Publications stored before citation counts were kept count as 0.
+        """
+        if by not in SORT_ORDERS:
+            raise ValueError(f"Unknown publication order '{by}' (expected one of {', '.join(SORT_ORDERS)})")
+        publications = [publication for publication in self._publications.values()
+                        if citations_int(publication) >= min_citations]
+        # Both sorts are stable, so equally cited publications stay most recent first
+        publications.sort(key=year_int, reverse=True)
+        if by == 'citations':
+            publications.sort(key=citations_int, reverse=True)
+        return publications
+
+    def save(self) -> bool:
+        """Write the store if its publications changed; returns True if written."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fh:
+                previous = json.load(fh)
+            if (previous.get('publications') == self._publications
+                    and previous.get('lastFullSync') == self.last_full_sync):
+                return False
+        except (OSError, json.JSONDecodeError):
+            pass
+        self.updated_at = datetime.now(timezone.utc).isoformat()
+        document = {'updatedAt': self.updated_at, 'lastFullSync': self.last_full_sync,
+                    'publications': self._publications}
+        write_atomic(self.path, json.dumps(document, indent=2, ensure_ascii=False) + '\n')
+        return True
+
+
+def render_publications_html(publications):
+    """Render the Recent Publications list."""
+    if publications:
+        publications_html = ""
+        for pub in publications:
+            # Scraped text: titles and venues may contain &, < or >
+            title = escape_text(pub['title'])
+            venue_text = f" {escape_text(pub['venue'])}" if pub['venue'] else ""
+            byline = f"{escape_text(pub['first_author'])} ({escape_text(str(pub['year']))}){venue_text}"
+            if pub['url']:
+                publications_html += f'    <li><a href="{escape_attr(pub["url"])}" target="_blank">{title}</a> - {byline}</li>\n'
+            else:
+                publications_html += f'    <li>{title} - {byline}</li>\n'
+    else:
+        publications_html = '    <li><em>Publications are automatically updated from <a href="https://scholar.google.com/citations?user=wgK6LCYAAAAJ" target="_blank">Google Scholar</a>. If this section appears empty, the automated script may need to be run.</em></li>\n'
+    return f'<ol reversed>\n{publications_html}</ol>'
+
+
+def known_publication_ids(full_sync: bool = False, store_file: str = PUBLICATIONS_STORE_FILE) -> Optional[Set[str]]:
+    """Ids to sync incrementally against, or None when a full sync is due."""
+    store = PublicationStore.open(store_file)
+    if full_sync or store.needs_full_sync():
+        return None
+    return store.ids()
+
+
+def is_plausible_fetch(publications: List[Dict], full_sync: bool) -> bool:
+    """A full sync must find MIN_PUBLICATIONS; an incremental one at least one row
+    (an empty first page means Scholar blocked the request)."""
+    return len(publications) >= MIN_PUBLICATIONS if full_sync else bool(publications)
+
+
+def store_publications(publications: List[Dict], full_sync: bool = True,
+                       store_file: str = PUBLICATIONS_STORE_FILE) -> List[Dict]:
+    """Merge fetched publications into the store; returns the rendered list."""
+    store = PublicationStore.open(store_file)
+    counts = store.merge(publications, complete=full_sync)
+    if store.save():
+        print(f"📝 {store_file}: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['removed']} removed, {len(store)} total")
+    else:
+        print(f"✓ {store_file} unchanged")
+    return store.sorted(PUBLICATIONS_SORT, MIN_CITATIONS)
+
+
+def update_html_with_publications(publications, html_file=HTML_FILE, full_sync=True):
+    """Merge publications into the store, save data/publications.json and re-render the HTML file."""
+    try:
+        save_section_data('publications', store_publications(publications, full_sync))
+        render_index(output=html_file)
+    except Exception as e:
+        print(f"Error updating HTML file: {e}")
+        return False
+
+    print(f"Successfully updated {html_file} with {len(publications)} publications")
+    return True
+
+
+def render_from_store(html_file: str = HTML_FILE, store_file: str = PUBLICATIONS_STORE_FILE) -> bool:
+    """Re-render the Publications section from the store without fetching."""
+    store = PublicationStore.open(store_file)
+    if not len(store):
+        print(f"⚠️  {store_file} is empty - nothing to render")
+        return False
+    save_section_data('publications', store.sorted(PUBLICATIONS_SORT, MIN_CITATIONS))
+    render_index(output=html_file)
+    return True
+
+
+def main():
+    configure_logging()
+    if '--render' in sys.argv:
+        sys.exit(0 if render_from_store() else 1)
+
+    backend = ScholarlyBackend() if '--scholarly' in sys.argv else RequestsBackend()
+    known_ids = known_publication_ids('--full-sync' in sys.argv)
+    publications = fetch_publications(backend, known_ids=known_ids)
+    print_preview(publications)
+    if not is_plausible_fetch(publications, known_ids is None):
+        print(f"Insufficient publications found ({len(publications)}). Not updating to prevent overwriting good content.")
+        sys.exit(1)
+    sys.exit(0 if update_html_with_publications(publications, full_sync=known_ids is None) else 1)
+
+
+if __name__ == '__main__':
+    main()
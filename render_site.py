@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Render index.html from templates/index.html and the JSON files under data/.
+
+The template is the page with every generated list left as an empty
+`<!-- section:name -->` / `<!-- /section:name -->` pair. It is compiled once
+into literal chunks and section slots, and each slot is filled by rendering
+the matching data file. The catalogue card grids are prerendered from
+catalogue_data.json the same way (see catalogue_cards.py). Updaters only
+write data files; page layout and static content are edited in the template.
+
+Usage:
+    python render_site.py
+
+A full render takes about a millisecond, so the page is always rendered
+(picking up changes to the renderers as well as to the template and data)
+and index.html is only rewritten when the result differs.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from catalogue_cards import render_catalogue_sections
+from catalogue_store import CATALOGUE_FILE, load_catalogue
+from html_sections import BEGIN_MARKER, END_MARKER, write_atomic
+
+TEMPLATE_FILE = os.path.join('templates', 'index.html')
+HTML_FILE = 'index.html'
+DATA_DIR = 'data'
+# The template says it is the source; the rendered page says not to edit it
+TEMPLATE_NOTICE = ('<!-- Source template for index.html: edit this file and data/*.json, '
+                   'then run render_site.py -->')
+GENERATED_NOTICE = ('<!-- Generated from templates/index.html and data/*.json by render_site.py '
+                    '- edit those, not this file -->')
+
+# Section name -> (data file, fields kept from each record)
+SECTION_DATA = {
+    'projects': ('projects.json', ('name', 'html_url', 'description')),
+    'contributor-projects': ('contributors.json',
+                             ('name', 'fork_url', 'description', 'is_contributor_to_parent', 'commits_ahead')),
+    'publications': ('publications.json', ('title', 'url', 'first_author', 'year', 'venue')),
+}
+
+Chunk = Union[str, Tuple[str, str]]
+
+
+def section_renderers() -> Dict[str, Callable[[List[Dict]], str]]:
+    from update_contributor_projects import render_contributor_projects_html
+    from update_projects import render_projects_html
+    from publications import render_publications_html
+
+    return {
+        'projects': render_projects_html,
+        'contributor-projects': render_contributor_projects_html,
+        'publications': render_publications_html,
+    }
+
+
+def data_path(name: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, SECTION_DATA[name][0])
+
+
+def load_section_data(name: str, data_dir: str = DATA_DIR) -> Optional[List[Dict]]:
+    try:
+        with open(data_path(name, data_dir), 'r', encoding='utf-8') as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+def save_section_data(name: str, records: List[Dict], data_dir: str = DATA_DIR) -> bool:
+    """Write a section's records (trimmed to the rendered fields) if they changed."""
+    fields = SECTION_DATA[name][1]
+    trimmed = [{field: record.get(field) for field in fields} for record in records]
+    encoded = json.dumps(trimmed, indent=2, ensure_ascii=False) + '\n'
+
+    path = data_path(name, data_dir)
+    try:
+        with open(path, 'r', encoding='utf-8') as fh:
+            if fh.read() == encoded:
+                return False
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    write_atomic(path, encoded)
+    return True
+
+
+@lru_cache(maxsize=4)
+def compile_template(text: str) -> Tuple[Chunk, ...]:
+    """Split a template into literal strings and (name, default body) slots.
+
+    Markers stay in the literal chunks, so every generated block remains
+    delimited in the rendered page. A slot with no data keeps the template's body.
+    The template's TEMPLATE_NOTICE becomes GENERATED_NOTICE in the output.
+    """
+    text = text.replace(TEMPLATE_NOTICE, GENERATED_NOTICE, 1)
+    chunks: List[Chunk] = []
+    cursor = 0
+    prefix = BEGIN_MARKER.split('{name}')[0]
+    while True:
+        start = text.find(prefix, cursor)
+        if start == -1:
+            break
+        name_end = text.find(' -->', start)
+        name = text[start + len(prefix):name_end]
+        body_start = name_end + len(' -->')
+        end = text.find(END_MARKER.format(name=name), body_start)
+        if end == -1:
+            raise ValueError(f"Template section '{name}' has no closing marker")
+        chunks.append(text[cursor:body_start])
+        chunks.append((name, text[body_start:end]))
+        cursor = end
+    chunks.append(text[cursor:])
+    return tuple(chunks)
+
+
+def render(compiled: Tuple[Chunk, ...], sections: Dict[str, str]) -> str:
+    """Fill a compiled template's slots from `sections`."""
+    parts = []
+    for chunk in compiled:
+        if isinstance(chunk, tuple):
+            name, default = chunk
+            parts.append('\n' + sections[name].strip('\n') + '\n' if name in sections else default)
+        else:
+            parts.append(chunk)
+    return ''.join(parts)
+
+
+def render_sections(data: Dict[str, Optional[List[Dict]]]) -> Dict[str, str]:
+    renderers = section_renderers()
+    return {name: renderers[name](records) for name, records in data.items() if records is not None}
+
+
+def render_index(template_file: str = TEMPLATE_FILE, output: str = HTML_FILE,
+                 data_dir: str = DATA_DIR, catalogue_file: str = CATALOGUE_FILE) -> bool:
+    """Render the page from the template and data files; returns True if written."""
+    with open(template_file, 'r', encoding='utf-8') as fh:
+        compiled = compile_template(fh.read())
+    data = {name: load_section_data(name, data_dir) for name in SECTION_DATA}
+    sections = render_sections(data)
+    if os.path.exists(catalogue_file):
+        sections.update(render_catalogue_sections(load_catalogue(catalogue_file)['items']))
+    page = render(compiled, sections)
+
+    try:
+        with open(output, 'r', encoding='utf-8') as fh:
+            changed = fh.read() != page
+    except FileNotFoundError:
+        changed = True
+    if changed:
+        write_atomic(output, page)
+        print(f"✅ Rendered {output} from {template_file}")
+    else:
+        print(f"✓ {output} unchanged - not rewriting")
+    return changed
+
+
+if __name__ == '__main__':
+    render_index()
@@ -0,0 +1,101 @@
+"""
+Extract the publication rows from a Google Scholar profile page.
+
+Each `tr.gsc_a_tr` row of the profile table yields its title, link, authors
+(first `gs_gray` div), venue (second `gs_gray` div, without the year Scholar
+repeats in a `gs_oph` span), year and citation count (`gsc_a_c` cell, as
+shown, e.g. '123' or '45*' for merged entries; '' when uncited). The lxml
+path compiles its XPath expressions once at import and walks the tree with
+C-backed lookups. When lxml is not installed, `extract_rows` falls back to
+BeautifulSoup with html.parser, which gives the same results, only slower
+(see benchmarks/bench_scholar_extract.py).
+
+Missing pieces come back as None; rows without a title cell are skipped.
+"""
+
+from typing import Dict, List, Optional
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one token of a space-separated class attribute."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+if etree is not None:
+    ROWS = etree.XPath(f'//tr[{_has_class("gsc_a_tr")}]')
+    TITLE_CELL = etree.XPath(f'.//td[{_has_class("gsc_a_t")}][1]')
+    TITLE_LINK = etree.XPath('(.//a)[1]')
+    GRAY_DIVS = etree.XPath(f'.//div[{_has_class("gs_gray")}]')
+    YEAR_SPAN = etree.XPath(f'(.//td[{_has_class("gsc_a_y")}][1]//span)[1]')
+    VENUE_TEXT = etree.XPath(f'.//text()[not(ancestor::span[{_has_class("gs_oph")}])]')
+    CITATIONS_CELL = etree.XPath(f'.//td[{_has_class("gsc_a_c")}][1]')
+
+
+def _venue(text: Optional[str]) -> Optional[str]:
+    return text.strip() if text is not None else None
+
+
+def extract_rows_lxml(html: str) -> List[Dict[str, Optional[str]]]:
+    """Extract rows with lxml and the precompiled XPath expressions."""
+    if not html.strip():
+        return []
+    document = lxml_html.document_fromstring(html)
+    rows = []
+    for row in ROWS(document):
+        cells = TITLE_CELL(row)
+        if not cells:
+            continue
+        cell = cells[0]
+        links = TITLE_LINK(cell)
+        grays = GRAY_DIVS(cell)
+        years = YEAR_SPAN(row)
+        citations = CITATIONS_CELL(row)
+        rows.append({
+            'title': links[0].text_content().strip() if links else None,
+            'link': links[0].get('href') if links else None,
+            'authors': grays[0].text_content().strip() if grays else None,
+            'venue': _venue(''.join(VENUE_TEXT(grays[1]))) if len(grays) > 1 else None,
+            'year': years[0].text_content().strip() if years else None,
+            'citations': citations[0].text_content().strip() if citations else None,
+        })
+    return rows
+
+
+def extract_rows_bs4(html: str) -> List[Dict[str, Optional[str]]]:
+    """Extract rows with BeautifulSoup's html.parser (no lxml needed)."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    rows = []
+    for row in soup.find_all('tr', class_='gsc_a_tr'):
+        cell = row.find('td', class_='gsc_a_t')
+        if not cell:
+            continue
+        link = cell.find('a')
+        grays = cell.find_all('div', class_='gs_gray')
+        year_cell = row.find('td', class_='gsc_a_y')
+        year_span = year_cell.find('span') if year_cell else None
+        citations_cell = row.find('td', class_='gsc_a_c')
+        venue = None
+        if len(grays) > 1:
+            venue = _venue(''.join(text for text in grays[1].find_all(string=True)
+                                   if not any('gs_oph' in (parent.get('class') or [])
+                                              for parent in text.parents if parent.name == 'span')))
+        rows.append({
+            'title': link.get_text().strip() if link else None,
+            'link': link.get('href') if link else None,
+            'authors': grays[0].get_text().strip() if grays else None,
+            'venue': venue,
+            'year': year_span.get_text().strip() if year_span else None,
+            'citations': citations_cell.get_text().strip() if citations_cell else None,
+        })
+    return rows
+
+
+extract_rows = extract_rows_lxml if etree is not None else extract_rows_bs4
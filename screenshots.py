@@ -0,0 +1,165 @@
+"""
+Build-time validation of catalogue screenshot URLs.
+
+`resolve_screenshot_url` guesses `screenshot.png` locations without checking
+them, so a missing image used to cost every visitor a failed request before
+the card fell back to its generated placeholder. This stage HEADs every
+screenshot concurrently, records what it found in a sidecar index and marks
+entries whose screenshot is known to be missing with `placeholder: true`,
+which the page renders directly without requesting the image.
+"""
+
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from build_state import CACHE_DIR, load_json_state, save_json_state
+from github_api import DEFAULT_WORKERS
+
+SCREENSHOT_INDEX_FILE = os.path.join(CACHE_DIR, 'screenshot_index.json')
+SCREENSHOT_TIMEOUT = 10
+# Statuses that mean the screenshot is gone, not just unavailable right now
+MISSING_STATUSES = {404, 410}
+# Enough of the file to find the dimensions of any PNG, GIF, WebP or JPEG
+HEADER_BYTES = 64 * 1024
+
+
+def image_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return (width, height) from the header of a PNG, GIF, WebP or JPEG."""
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and len(data) >= 24:
+        return struct.unpack('>II', data[16:24])
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        return struct.unpack('<HH', data[6:10])
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP' and len(data) >= 30:
+        chunk = data[12:16]
+        if chunk == b'VP8 ':
+            width, height = struct.unpack('<HH', data[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b'VP8L':
+            bits = int.from_bytes(data[21:25], 'little')
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b'VP8X':
+            return int.from_bytes(data[24:27], 'little') + 1, int.from_bytes(data[27:30], 'little') + 1
+    if data[:2] == b'\xff\xd8':
+        offset = 2
+        while offset + 9 < len(data):
+            if data[offset] != 0xFF:
+                offset += 1
+                continue
+            marker = data[offset + 1]
+            # SOF0-SOF15 except DHT (C4), JPG (C8) and DAC (CC) carry the frame size
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+                return width, height
+            segment_length = struct.unpack('>H', data[offset + 2:offset + 4])[0]
+            offset += 2 + segment_length
+    return None
+
+
+def fetch_dimensions(http, url: str) -> Optional[Tuple[int, int]]:
+    """Read just the start of an image and parse its dimensions."""
+    try:
+        response = http.get(url, headers={'Range': f'bytes=0-{HEADER_BYTES - 1}'},
+                            timeout=SCREENSHOT_TIMEOUT, stream=True)
+        try:
+            if response.status_code not in (200, 206):
+                return None
+            data = b''
+            for chunk in response.iter_content(8192):
+                data += chunk
+                if len(data) >= HEADER_BYTES:
+                    break
+        finally:
+            response.close()
+    except requests.RequestException:
+        return None
+    return image_dimensions(data)
+
+
+def check_screenshot(http, url: str, previous: Optional[Dict]) -> Dict:
+    """HEAD one screenshot URL, reusing known dimensions if it is unchanged."""
+    record = {
+        'status': None,
+        'contentType': None,
+        'contentLength': None,
+        'etag': None,
+        'width': None,
+        'height': None,
+        'checkedAt': datetime.now(timezone.utc).isoformat()
+    }
+    try:
+        response = http.head(url, timeout=SCREENSHOT_TIMEOUT, allow_redirects=True)
+        if response.status_code == 405:
+            # Some static hosts refuse HEAD; a tiny ranged GET answers the same question
+            response = http.get(url, headers={'Range': 'bytes=0-0'}, timeout=SCREENSHOT_TIMEOUT)
+            if response.status_code == 206:
+                response.status_code = 200
+    except requests.RequestException:
+        return record
+
+    record['status'] = response.status_code
+    record['contentType'] = response.headers.get('Content-Type')
+    record['contentLength'] = response.headers.get('Content-Length')
+    record['etag'] = response.headers.get('ETag')
+
+    if is_image_response(record):
+        unchanged = previous and all(previous.get(k) == record[k] for k in ('etag', 'contentLength'))
+        if unchanged and previous.get('width'):
+            record['width'], record['height'] = previous['width'], previous['height']
+        else:
+            dims = fetch_dimensions(http, url)
+            if dims:
+                record['width'], record['height'] = dims
+    return record
+
+
+def is_image_response(record: Dict) -> bool:
+    # SPA hosts (Firebase, Netlify rewrites) answer 200 with index.html for missing files
+    content_type = (record.get('contentType') or '').lower()
+    return record.get('status') == 200 and (not content_type or content_type.startswith('image/'))
+
+
+def is_missing(record: Optional[Dict]) -> bool:
+    """True if the screenshot definitely does not exist.
+
+    Only a 404/410, or a 200 that isn't an image, counts. Network errors,
+    rate limiting (429, 403) and 5xx responses are treated as unknown, so a
+    flaky or throttling host does not swap a real screenshot for the
+    placeholder.
+    """
+    if not record or record.get('status') is None:
+        return False
+    status = record['status']
+    if status == 200:
+        return not is_image_response(record)
+    return status in MISSING_STATUSES
+
+
+def validate_screenshots(entries: List[Dict], session=None, workers: int = DEFAULT_WORKERS) -> Dict[str, Dict]:
+    """Check every entry's screenshot and set/clear its `placeholder` flag.
+
+    Returns the updated index, which is also written to SCREENSHOT_INDEX_FILE.
+    """
+    http = session or requests
+    previous_index = load_json_state(SCREENSHOT_INDEX_FILE)
+    urls = sorted({entry['screenshot'] for entry in entries if entry.get('screenshot')})
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+        records = executor.map(lambda url: check_screenshot(http, url, previous_index.get(url)), urls)
+        index = dict(zip(urls, records))
+
+    missing = 0
+    for entry in entries:
+        if is_missing(index.get(entry.get('screenshot'))):
+            entry['placeholder'] = True
+            missing += 1
+        else:
+            entry.pop('placeholder', None)
+
+    save_json_state(SCREENSHOT_INDEX_FILE, index)
+    print(f"🖼️  Checked {len(urls)} screenshots: {missing} entries will use the placeholder")
+    return index
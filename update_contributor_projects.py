@@ -1,43 +1,131 @@
-import requests
 import os
-from datetime import datetime
-import re
-from bs4 import BeautifulSoup
-
-def get_github_forks(username, token=None):
-    """Fetch all forked repositories for a given username."""
-    headers = {}
-    if token:
-        headers['Authorization'] = f'token {token}'
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from build_state import CACHE_DIR, load_json_state, save_json_state
+from github_api import GITHUB_API, DEFAULT_WORKERS, create_session, print_cache_summary, print_rate_limit_summary
+from html_sections import render_list
+from render_site import render_index, save_section_data
+
+CONTRIBUTOR_CACHE_FILE = os.path.join(CACHE_DIR, 'contributor_membership.json')
+# How long a "user has (not) contributed to this parent" answer is trusted
+CONTRIBUTOR_CACHE_TTL = timedelta(days=float(os.getenv('CONTRIBUTOR_CACHE_TTL_DAYS', '3')))
+CONTRIBUTORS_PER_PAGE = 100
+FORK_STATE_FILE = os.path.join(CACHE_DIR, 'fork_state.json')
+# Bump when analyze_fork changes so saved analyses are recomputed
+FORK_STATE_VERSION = 2
+
+# One lock per parent repo, so forks of the same parent analysed on
+# different threads wait for a single lookup instead of repeating it
+_membership_locks: Dict[str, threading.Lock] = {}
+_membership_locks_guard = threading.Lock()
+
+def get_github_forks(username, token=None, session=None, workers=DEFAULT_WORKERS):
+    """Fetch all forked repositories for a given username.
+
+    The per-fork detail lookups run on a pool of `workers` threads sharing
+    one session; the result keeps the listing order.
+    """
+    if session is None:
+        session = create_session(token, pool_size=workers)
     
     # Get all repositories
     repos = []
     page = 1
     while True:
-        url = f'https://api.github.com/users/{username}/repos?page={page}&per_page=100'
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200 or not response.json():
+        url = f'{GITHUB_API}/users/{username}/repos?page={page}&per_page=100'
+        response = session.get(url)
+        response.raise_for_status()
+        if not response.json():
             break
         repos.extend(response.json())
         page += 1
 
     # Filter to only forked repositories and get detailed info
-    forked_repos = []
-    for repo in repos:
-        if repo.get('fork', False):
-            # Get detailed repository information which includes parent info
-            detail_url = f'https://api.github.com/repos/{repo["full_name"]}'
-            detail_response = requests.get(detail_url, headers=headers)
-            if detail_response.status_code == 200:
-                detailed_repo = detail_response.json()
-                forked_repos.append(detailed_repo)
-            else:
-                forked_repos.append(repo)  # fallback to basic info
-    
-    return forked_repos
+    forks = [repo for repo in repos if repo.get('fork', False)]
+    if workers > 1 and len(forks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda repo: get_fork_details(session, repo), forks))
+    return [get_fork_details(session, repo) for repo in forks]
+
+def get_fork_details(session, repo):
+    """Detailed repository information (which includes parent info), or the listing entry."""
+    detail_url = f'{GITHUB_API}/repos/{repo["full_name"]}'
+    detail_response = session.get(detail_url)
+    if detail_response.status_code == 200:
+        return detail_response.json()
+    return repo  # fallback to basic info
+
+def membership_lock(key: str) -> threading.Lock:
+    with _membership_locks_guard:
+        return _membership_locks.setdefault(key, threading.Lock())
+
+def has_authored_commits(session, parent_full_name: str, username: str) -> Optional[bool]:
+    """Ask for one commit by `username` in the parent; None if the API can't say."""
+    url = f'{GITHUB_API}/repos/{parent_full_name}/commits'
+    response = session.get(url, params={'author': username, 'per_page': 1})
+    if response.status_code == 200:
+        return bool(response.json())
+    if response.status_code == 409:  # empty repository
+        return False
+    return None
+
+def is_listed_contributor(session, parent_full_name: str, username: str) -> Optional[bool]:
+    """Walk the parent's contributor pages, stopping at the first match; None if a page fails."""
+    url = f'{GITHUB_API}/repos/{parent_full_name}/contributors'
+    login = username.lower()
+    page = 1
+    while True:
+        response = session.get(url, params={'per_page': CONTRIBUTORS_PER_PAGE, 'page': page})
+        if response.status_code != 200:
+            return None
+        contributors = response.json()
+        if any(contributor.get('login', '').lower() == login for contributor in contributors):
+            return True
+        if len(contributors) < CONTRIBUTORS_PER_PAGE:
+            return False
+        page += 1
+
+def is_parent_contributor(session, parent_full_name: str, username: str,
+                          memberships: Optional[Dict[str, Dict]] = None) -> Optional[bool]:
+    """True if `username` has commits in the parent repository, None if the API can't tell.
+
+    One `?author=` commits request answers this for almost every repo; the
+    paginated contributors list is only walked when that request fails.
+    Answers are stored in `memberships` (keyed by parent) and reused within
+    CONTRIBUTOR_CACHE_TTL, so a parent shared by several forks is checked once.
+    A None (both lookups failed) is not stored, so the next run asks again.
+    """
+    key = f'{parent_full_name.lower()}:{username.lower()}'
+    with membership_lock(key):
+        cached = (memberships or {}).get(key)
+        if cached and cached.get('checkedAt'):
+            checked_at = datetime.fromisoformat(cached['checkedAt'])
+            if datetime.now(timezone.utc) - checked_at < CONTRIBUTOR_CACHE_TTL:
+                return cached['contributor']
+
+        contributor = has_authored_commits(session, parent_full_name, username)
+        if contributor is None:
+            contributor = is_listed_contributor(session, parent_full_name, username)
+        if memberships is not None and contributor is not None:
+            memberships[key] = {
+                'contributor': contributor,
+                'checkedAt': datetime.now(timezone.utc).isoformat()
+            }
+        return contributor
+
+def analyze_fork(repo, username, session, memberships=None):
+    """Analyze a forked repository for contributions and commits ahead.
 
-def analyze_fork(repo, username, headers):
-    """Analyze a forked repository for contributions and commits ahead."""
+    `memberships` is an optional contributor cache (see is_parent_contributor).
+    `complete` is False when any lookup failed; the zero/False defaults
+    then stand in for answers the API didn't give, so the analysis is not
+    worth saving.
+    """
     fork_name = repo['name']
     fork_full_name = repo['full_name']
     parent_full_name = repo['parent']['full_name'] if 'parent' in repo else None
@@ -55,86 +143,158 @@ def analyze_fork(repo, username, headers):
         'commits_behind': 0,
         'last_fork_commit': None,
         'last_parent_commit': None,
-        'significant_commits': []
+        'significant_commits': [],
+        'complete': True
     }
     
     # Check if user is a contributor to the parent repository
     try:
-        contributors_url = f'https://api.github.com/repos/{parent_full_name}/contributors'
-        response = requests.get(contributors_url, headers=headers)
-        if response.status_code == 200:
-            contributors = response.json()
-            for contributor in contributors:
-                if contributor['login'].lower() == username.lower():
-                    analysis['is_contributor_to_parent'] = True
-                    break
+        contributor = is_parent_contributor(session, parent_full_name, username, memberships)
+        analysis['is_contributor_to_parent'] = bool(contributor)
+        analysis['complete'] = contributor is not None
     except Exception as e:
-        pass
+        analysis['complete'] = False
     
     # Compare commits between fork and parent
     try:
-        compare_url = f'https://api.github.com/repos/{parent_full_name}/compare/{repo["parent"]["default_branch"]}...{username}:{repo["default_branch"]}'
-        response = requests.get(compare_url, headers=headers)
+        compare_url = f'{GITHUB_API}/repos/{parent_full_name}/compare/{repo["parent"]["default_branch"]}...{username}:{repo["default_branch"]}'
+        response = session.get(compare_url)
         if response.status_code == 200:
             compare_data = response.json()
             analysis['commits_ahead'] = compare_data.get('ahead_by', 0)
             analysis['commits_behind'] = compare_data.get('behind_by', 0)
+        else:
+            analysis['complete'] = False
     except Exception as e:
-        pass
+        analysis['complete'] = False
     
     # Get last commit date for fork
     try:
-        fork_commits_url = f'https://api.github.com/repos/{fork_full_name}/commits'
-        response = requests.get(fork_commits_url, headers=headers)
+        fork_commits_url = f'{GITHUB_API}/repos/{fork_full_name}/commits'
+        response = session.get(fork_commits_url)
         if response.status_code == 200 and response.json():
             analysis['last_fork_commit'] = response.json()[0]['commit']['committer']['date']
             analysis['last_fork_commit_parsed'] = datetime.strptime(analysis['last_fork_commit'], '%Y-%m-%dT%H:%M:%SZ')
+        elif response.status_code not in (200, 409):  # 409: empty repository
+            analysis['complete'] = False
     except Exception as e:
         analysis['last_fork_commit_parsed'] = datetime.min
+        analysis['complete'] = False
     
     return analysis
 
-def get_significant_forks(username, token=None):
-    """Get significant forks (contributor projects) sorted by most recent commit."""
-    headers = {}
-    if token:
-        headers['Authorization'] = f'token {token}'
+def timed_analysis(repo, username, session, memberships=None):
+    """Run analyze_fork, returning (analysis or None, seconds taken)."""
+    start = time.perf_counter()
+    try:
+        analysis = analyze_fork(repo, username, session, memberships)
+    except Exception as e:
+        analysis = None
+    return analysis, time.perf_counter() - start
+
+def load_fork_state() -> Dict:
+    """Load the per-fork pushed_at watermarks and analyses from the last run."""
+    state = load_json_state(FORK_STATE_FILE)
+    return state if state.get('version') == FORK_STATE_VERSION else {}
+
+def fork_watermark(repo) -> Optional[Dict]:
+    """The fork's and its parent's pushed_at, or None if either is unknown."""
+    parent = repo.get('parent') or {}
+    if not repo.get('pushed_at') or not parent.get('pushed_at'):
+        return None
+    return {'pushed_at': repo['pushed_at'], 'parent_pushed_at': parent['pushed_at']}
+
+def reuse_analysis(prior: Optional[Dict], watermark: Optional[Dict]) -> Optional[Dict]:
+    """The saved analysis if neither the fork nor its parent was pushed since."""
+    if not prior or watermark is None:
+        return None
+    if (prior.get('pushed_at') != watermark['pushed_at']
+            or prior.get('parent_pushed_at') != watermark['parent_pushed_at']):
+        return None
+    analysis = dict(prior['analysis'])
+    if analysis.get('last_fork_commit'):
+        analysis['last_fork_commit_parsed'] = datetime.strptime(analysis['last_fork_commit'], '%Y-%m-%dT%H:%M:%SZ')
+    return analysis
+
+def get_significant_forks(username, token=None, session=None, workers=DEFAULT_WORKERS,
+                          force_refresh=False):
+    """Get significant forks (contributor projects) sorted by most recent commit.
+
+    Forks are analysed on a pool of `workers` threads sharing one session;
+    `workers=1` keeps the original serial behaviour. Results are collected in
+    listing order before the (stable) sort, so the output does not depend on
+    which request finishes first.
+
+    A fork whose pushed_at and parent pushed_at match the last run reuses its
+    saved analysis (commits ahead can only change when one of them is
+    pushed); `force_refresh` re-analyses every fork and re-checks every
+    contributor answer. Only complete analyses are saved, so a fork whose
+    lookups failed is analysed again on the next run.
+    """
+    if session is None:
+        session = create_session(token, pool_size=workers)
     
-    forked_repos = get_github_forks(username, token)
+    forked_repos = get_github_forks(username, token, session, workers)
+    # Per-parent contributor answers from previous runs
+    memberships = {} if force_refresh else load_json_state(CONTRIBUTOR_CACHE_FILE)
+    previous_forks = {} if force_refresh else load_fork_state().get('forks', {})
+
+    results = [(reuse_analysis(previous_forks.get(repo['full_name']), fork_watermark(repo)), 0.0)
+               for repo in forked_repos]
+    stale = [repo for repo, (analysis, _) in zip(forked_repos, results) if analysis is None]
+
+    start = time.perf_counter()
+    if workers > 1 and len(stale) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            analysed = list(executor.map(lambda repo: timed_analysis(repo, username, session, memberships), stale))
+    else:
+        analysed = [timed_analysis(repo, username, session, memberships) for repo in stale]
+    wall_time = time.perf_counter() - start
+    save_json_state(CONTRIBUTOR_CACHE_FILE, memberships)
+
+    analysed_iter = iter(analysed)
+    results = [result if result[0] is not None else next(analysed_iter) for result in results]
+    serial_time = sum(seconds for _, seconds in analysed)
+    if stale and wall_time > 0:
+        print(f"⚡ Analysed {len(stale)} forks in {wall_time:.1f}s with {workers} worker{'s' if workers != 1 else ''} "
+              f"(~{serial_time:.1f}s serially, {serial_time / wall_time:.1f}x speedup)")
+    if len(stale) < len(forked_repos):
+        print(f"♻️  Reused {len(forked_repos) - len(stale)} unchanged fork analyses")
+
+    new_forks = {}
+    for repo, (analysis, _) in zip(forked_repos, results):
+        watermark = fork_watermark(repo)
+        if analysis and watermark and analysis.get('complete'):
+            saved = {key: value for key, value in analysis.items() if key != 'last_fork_commit_parsed'}
+            new_forks[repo['full_name']] = dict(watermark, analysis=saved)
+    if forked_repos:
+        save_json_state(FORK_STATE_FILE, {'version': FORK_STATE_VERSION, 'forks': new_forks})
+
     significant_forks = []
-    
-    for repo in forked_repos:
-        try:
-            analysis = analyze_fork(repo, username, headers)
-            if analysis:
-                # Ensure last_fork_commit_parsed is always set
-                if 'last_fork_commit_parsed' not in analysis:
-                    analysis['last_fork_commit_parsed'] = datetime.min
-                
-                # Consider a fork significant if:
-                # 1. User is a contributor to parent, OR
-                # 2. Fork has commits ahead
-                is_significant = (
-                    analysis['is_contributor_to_parent'] or 
-                    analysis['commits_ahead'] > 0
-                )
-                
-                if is_significant:
-                    significant_forks.append(analysis)
-        except Exception as e:
-            continue
+    for analysis, _ in results:
+        if analysis:
+            # Ensure last_fork_commit_parsed is always set
+            if 'last_fork_commit_parsed' not in analysis:
+                analysis['last_fork_commit_parsed'] = datetime.min
+            
+            # Consider a fork significant if:
+            # 1. User is a contributor to parent, OR
+            # 2. Fork has commits ahead
+            is_significant = (
+                analysis['is_contributor_to_parent'] or 
+                analysis['commits_ahead'] > 0
+            )
+            
+            if is_significant:
+                significant_forks.append(analysis)
     
     # Sort by most recent commit date
     significant_forks.sort(key=lambda x: x.get('last_fork_commit_parsed', datetime.min), reverse=True)
     
     return significant_forks
 
-def update_html_with_contributor_projects(contributor_projects, html_file):
-    """Update the index.html file with contributor projects section."""
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Create contributor projects HTML
+def render_contributor_projects_html(contributor_projects):
+    """Render the Contributor Projects list."""
     contributor_items = []
     for project in contributor_projects:
         description = project['description'] or 'Contributor project'
@@ -152,24 +312,12 @@ def update_html_with_contributor_projects(contributor_projects, html_file):
         li_html = f'<li><a href="{project["fork_url"]}" target="_blank">{project["name"]}</a> - {description}</li>'
         contributor_items.append(li_html)
 
-    contributor_html = '<ul>\n    ' + '\n    '.join(contributor_items) + '\n</ul>'
-    
-    # Check if contributor projects section already exists
-    contributor_pattern = r'<h2 id="contributor-projects">Contributor Projects</h2>\s*<ul>.*?</ul>'
-    
-    if re.search(contributor_pattern, content, flags=re.DOTALL):
-        # Update existing section
-        new_contributor_section = f'<h2 id="contributor-projects">Contributor Projects</h2>\n{contributor_html}'
-        updated_content = re.sub(contributor_pattern, new_contributor_section, content, flags=re.DOTALL)
-    else:
-        # Add new section after Recent Projects
-        projects_pattern = r'(<h2 id="projects">Recent Projects</h2>\s*<ul>.*?</ul>)'
-        new_contributor_section = f'\\1\n\n<hr>\n\n<h2 id="contributor-projects">Contributor Projects</h2>\n{contributor_html}'
-        updated_content = re.sub(projects_pattern, new_contributor_section, content, flags=re.DOTALL)
+    return render_list(contributor_items)
 
-    # Write the updated content back to the file
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+def update_html_with_contributor_projects(contributor_projects, html_file):
+    """Save contributor projects to data/contributors.json and re-render index.html."""
+    save_section_data('contributor-projects', contributor_projects)
+    render_index(output=html_file)
 
 def main():
     USERNAME = 'kylemath'
@@ -179,7 +327,9 @@ def main():
     print(f"Getting contributor projects for {USERNAME}...")
     
     # Get significant forks (contributor projects)
-    contributor_projects = get_significant_forks(USERNAME, TOKEN)
+    session = create_session(TOKEN)
+    contributor_projects = get_significant_forks(USERNAME, TOKEN, session,
+                                                 force_refresh='--force-refresh' in sys.argv)
     
     print(f"Found {len(contributor_projects)} contributor projects:")
     for project in contributor_projects:
@@ -200,6 +350,8 @@ def main():
         print(f"Updated {HTML_FILE} with {len(contributor_projects)} contributor projects.")
     else:
         print("No contributor projects found - keeping existing content if any.")
+    print_cache_summary(session)
+    print_rate_limit_summary(session)
 
 if __name__ == '__main__':
     main() 
\ No newline at end of file
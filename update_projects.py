@@ -1,31 +1,78 @@
 import requests
-from datetime import datetime, timezone
-import re
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta, timezone
 import os
+import sys
 import json
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import List, Dict, Optional, Tuple
 
+from catalogue_store import CATALOGUE_FILE, CatalogueStore, load_catalogue
+from screenshots import validate_screenshots
+from build_state import CACHE_DIR, load_json_state, save_json_state
+from github_api import GITHUB_API, GITHUB_GRAPHQL, DEFAULT_WORKERS, create_session, print_cache_summary, print_rate_limit_summary
+from html_sections import escape_attr, escape_text, render_list
+from render_site import render_index, save_section_data
+
 KIND_DEFAULT = 'project'
-CATALOGUE_FILE = 'catalogue_data.json'
 CATALOGUE_ENTRY_FILE = 'catalogue.json'
+CATALOGUE_STATE_FILE = os.path.join(CACHE_DIR, 'catalogue_state.json')
+CATALOGUE_PROBE_FILE = os.path.join(CACHE_DIR, 'catalogue_probes.json')
+CATALOGUE_PROBE_TIMEOUT = 5
+# Hard limit on the time spent looking for one repo's catalogue.json
+CATALOGUE_PROBE_DEADLINE = float(os.getenv('CATALOGUE_PROBE_DEADLINE', '8'))
+# How long a "no catalogue.json anywhere" result is trusted if the repo is untouched
+CATALOGUE_MISS_TTL = timedelta(days=float(os.getenv('CATALOGUE_MISS_TTL_DAYS', '7')))
+# Responses that definitely mean "no catalogue.json here"; anything else
+# (timeouts, 429, 5xx) says nothing and is never recorded as a miss
+CATALOGUE_MISSING_STATUSES = {404, 410}
+# Bump when build_catalogue_entry changes so incremental runs rebuild everything
+CATALOGUE_STATE_VERSION = 1
 KNOWN_KINDS = {'project', 'longform', 'page'}
+REPO_ACCEPT = 'application/vnd.github.mercy-preview+json'
 
-def get_github_repos(username, token=None):
-    """Fetch all repositories for a given username, sorted by commit/creation/name."""
-    headers = {
-        'Accept': 'application/vnd.github.mercy-preview+json'
+REPOS_QUERY = """
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC,
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        isFork
+        isPrivate
+        description
+        url
+        homepageUrl
+        createdAt
+        updatedAt
+        pushedAt
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        defaultBranchRef { name target { ... on Commit { committedDate } } }
+      }
     }
-    if token:
-        headers['Authorization'] = f'token {token}'
-    
+  }
+}
+"""
+
+def get_github_repos(username, token=None, workers=DEFAULT_WORKERS, session=None):
+    """Fetch all repositories for a given username, sorted by commit/creation/name.
+
+    The per-repo last-commit lookups run on a pool of `workers` threads
+    sharing one session; `workers=1` keeps the original serial behaviour.
+    """
+    if session is None:
+        session = create_session(token, accept=REPO_ACCEPT, pool_size=workers)
+
     repos = []
     page = 1
     while True:
-        url = f'https://api.github.com/users/{username}/repos?page={page}&per_page=100&sort=updated'
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            break
+        url = f'{GITHUB_API}/users/{username}/repos?page={page}&per_page=100&sort=updated'
+        response = session.get(url)
+        # A failed page must not pass for the end of the list: that would
+        # publish a truncated catalogue
+        response.raise_for_status()
         payload = response.json()
         if not payload:
             break
@@ -34,26 +81,45 @@ def get_github_repos(username, token=None):
 
     original_repos = [repo for repo in repos if not repo.get('fork', False)]
 
-    for repo in original_repos:
-        commits_url = f'https://api.github.com/repos/{username}/{repo["name"]}/commits'
-        response = requests.get(commits_url, headers=headers)
-        if response.status_code == 200 and response.json():
-            last_commit = response.json()[0]['commit']['committer']['date']
-            repo['last_commit_date'] = datetime.strptime(last_commit, '%Y-%m-%dT%H:%M:%SZ')
-            repo['last_commit_ts'] = repo['last_commit_date'].timestamp()
-        else:
-            repo['last_commit_date'] = None
-            repo['last_commit_ts'] = 0
-        created_at = repo.get('created_at')
-        if created_at:
-            created_dt = datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%SZ')
-        else:
-            created_dt = datetime(1970, 1, 1, tzinfo=timezone.utc)
-        repo['created_at_dt'] = created_dt
-        repo['created_at_ts'] = created_dt.timestamp()
+    if workers > 1 and len(original_repos) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(lambda repo: enrich_repo(session, username, repo), original_repos))
+    else:
+        for repo in original_repos:
+            enrich_repo(session, username, repo)
 
+    return sort_repos(original_repos)
+
+def enrich_repo(session, username: str, repo: Dict) -> Dict:
+    """Attach last-commit and creation timestamps to a repo payload in place."""
+    commits_url = f'{GITHUB_API}/repos/{username}/{repo["name"]}/commits'
+    response = session.get(commits_url)
+    last_commit = None
+    if response.status_code == 200 and response.json():
+        last_commit = response.json()[0]['commit']['committer']['date']
+    return apply_commit_dates(repo, last_commit)
+
+def apply_commit_dates(repo: Dict, last_commit: Optional[str]) -> Dict:
+    """Set the parsed last-commit/creation fields used for sorting."""
+    if last_commit:
+        repo['last_commit_date'] = datetime.strptime(last_commit, '%Y-%m-%dT%H:%M:%SZ')
+        repo['last_commit_ts'] = repo['last_commit_date'].timestamp()
+    else:
+        repo['last_commit_date'] = None
+        repo['last_commit_ts'] = 0
+    created_at = repo.get('created_at')
+    if created_at:
+        created_dt = datetime.strptime(created_at, '%Y-%m-%dT%H:%M:%SZ')
+    else:
+        created_dt = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    repo['created_at_dt'] = created_dt
+    repo['created_at_ts'] = created_dt.timestamp()
+    return repo
+
+def sort_repos(repos: List[Dict]) -> List[Dict]:
+    """Order repos by last commit, then creation date, then name."""
     return sorted(
-        original_repos,
+        repos,
         key=lambda repo: (
             -repo['last_commit_ts'],
             -repo['created_at_ts'],
@@ -61,46 +127,184 @@ def get_github_repos(username, token=None):
         )
     )
 
-def fetch_catalogue_metadata(username: str, repo: Dict) -> Optional[Dict]:
-    """Attempt to load per-repo catalogue metadata JSON.
+def get_github_repos_graphql(username, token, session=None):
+    """Fetch the same sorted repo list as get_github_repos using GraphQL.
+
+    Each page returns up to 100 repos together with the last commit on their
+    default branch, replacing the per-repo /commits fan-out. GraphQL always
+    requires a token. Like the REST listing, only public repos are returned,
+    even when the token can see private ones.
+    """
+    if session is None:
+        session = create_session(token)
+
+    repos = []
+    cursor = None
+    while True:
+        response = session.post(
+            GITHUB_GRAPHQL,
+            json={'query': REPOS_QUERY, 'variables': {'login': username, 'cursor': cursor}}
+        )
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('errors'):
+            raise RuntimeError(f"GitHub GraphQL API error: {payload['errors'][0].get('message')}")
+        connection = ((payload.get('data') or {}).get('user') or {}).get('repositories')
+        if not connection:
+            break
+        repos.extend(graphql_node_to_repo(node) for node in connection['nodes'])
+        if not connection['pageInfo']['hasNextPage']:
+            break
+        cursor = connection['pageInfo']['endCursor']
+
+    original_repos = [repo for repo in repos if not repo['fork']]
+    return sort_repos(original_repos)
+
+def graphql_node_to_repo(node: Dict) -> Dict:
+    """Convert a GraphQL repository node to the REST payload shape."""
+    branch = node.get('defaultBranchRef') or {}
+    target = branch.get('target') or {}
+    repo = {
+        'name': node['name'],
+        'full_name': node['nameWithOwner'],
+        'fork': node['isFork'],
+        'private': node['isPrivate'],
+        'description': node.get('description'),
+        'html_url': node['url'],
+        'homepage': node.get('homepageUrl'),
+        'default_branch': branch.get('name'),
+        # REST returns topic names alphabetically
+        'topics': sorted(t['topic']['name'] for t in node['repositoryTopics']['nodes']),
+        'created_at': node.get('createdAt'),
+        'updated_at': node.get('updatedAt'),
+        'pushed_at': node.get('pushedAt'),
+    }
+    return apply_commit_dates(repo, target.get('committedDate'))
+
+def catalogue_candidate_urls(username: str, repo: Dict) -> List[str]:
+    """Return the locations where a repo's catalogue.json may live, in priority order.
     
-    Checks in this order:
     1. Public deployment URL (homepage) - for private repos with public sites
     2. GitHub raw URLs - for public repos
     """
-    
-    # First, try the repo's homepage if it exists (for public deployments like Netlify)
+    urls = []
     homepage = repo.get('homepage')
     if homepage and homepage.strip():
-        homepage = homepage.rstrip('/')
-        # Try multiple common locations on the public site
-        catalogue_urls = [
+        homepage = homepage.strip().rstrip('/')
+        urls += [
             f"{homepage}/{CATALOGUE_ENTRY_FILE}",
             f"{homepage}/assets/{CATALOGUE_ENTRY_FILE}",
             f"{homepage}/public/{CATALOGUE_ENTRY_FILE}",
             f"{homepage}/.well-known/{CATALOGUE_ENTRY_FILE}"
         ]
-        for url in catalogue_urls:
-            try:
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    return json.loads(response.text)
-            except (requests.RequestException, json.JSONDecodeError):
-                continue
-    
-    # Fallback to GitHub raw URLs (for public repos)
-    branches = [repo.get('default_branch') or 'main', 'main', 'master']
-    for branch in branches:
-        if not branch:
-            continue
+    for branch in [repo.get('default_branch') or 'main', 'main', 'master']:
         raw_url = f'https://raw.githubusercontent.com/{username}/{repo["name"]}/{branch}/{CATALOGUE_ENTRY_FILE}'
-        response = requests.get(raw_url)
-        if response.status_code == 200:
-            try:
-                return json.loads(response.text)
-            except json.JSONDecodeError:
-                return None
-    return None
+        if raw_url not in urls:
+            urls.append(raw_url)
+    return urls
+
+def probe_catalogue_url(http, url: str, timeout: float) -> Tuple[Optional[Dict], bool]:
+    """GET one candidate URL, returning (parsed JSON or None, answered).
+
+    `answered` is True when the URL gave a definite answer: the JSON, a
+    404/410, or a 200 that isn't JSON (e.g. a site's HTML fallback page).
+    """
+    try:
+        response = http.get(url, timeout=timeout)
+    except requests.RequestException:
+        return None, False
+    if response.status_code == 200:
+        try:
+            return json.loads(response.text), True
+        except json.JSONDecodeError:
+            return None, True
+    return None, response.status_code in CATALOGUE_MISSING_STATUSES
+
+def probe_catalogue_urls(http, urls: List[str], deadline: float) -> Tuple[Optional[Dict], Optional[str], bool]:
+    """Probe all candidates concurrently; the first success wins.
+
+    Returns (metadata, url, True) on a hit, (None, None, True) when every
+    candidate definitely has no catalogue.json, and (None, None, False) when
+    some candidate failed or the deadline passed before it answered.
+    Outstanding probes are abandoned, not awaited.
+    """
+    if not urls:
+        return None, None, True
+    end = time.monotonic() + deadline
+    timeout = min(CATALOGUE_PROBE_TIMEOUT, deadline)
+    executor = ThreadPoolExecutor(max_workers=len(urls))
+    futures = {executor.submit(probe_catalogue_url, http, url, timeout): url for url in urls}
+    pending = set(futures)
+    answered_all = True
+    try:
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                answered_all = False
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            # Several may finish together; prefer the higher-priority location
+            for future in sorted(done, key=lambda f: urls.index(futures[f])):
+                metadata, answered = future.result()
+                if metadata is not None:
+                    return metadata, futures[future], True
+                answered_all = answered_all and answered
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None, None, answered_all
+
+def is_known_miss(probe: Optional[Dict], repo: Dict) -> bool:
+    """True if the last probe found no catalogue.json, within the TTL, and
+    neither the repo's pushed_at nor its homepage has changed since."""
+    if not probe or probe.get('url') or not probe.get('checkedAt') or probe.get('unresolved'):
+        return False
+    if probe.get('pushedAt') != repo.get('pushed_at') or probe.get('homepage') != repo.get('homepage'):
+        return False
+    checked_at = datetime.fromisoformat(probe['checkedAt'])
+    return datetime.now(timezone.utc) - checked_at < CATALOGUE_MISS_TTL
+
+def fetch_catalogue_metadata(username: str, repo: Dict, session=None,
+                             probes: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+    """Attempt to load per-repo catalogue metadata JSON.
+    
+    The URL that worked last time (from `probes`) is tried on its own first;
+    otherwise every candidate location is probed concurrently within
+    CATALOGUE_PROBE_DEADLINE seconds. The hit or miss is recorded back into
+    `probes`, and a recent miss for an unchanged repo skips probing entirely.
+    A miss is only recorded when every candidate answered definitely; after
+    errors or an expired deadline the record is marked `unresolved` and the
+    repo is probed again next run.
+    """
+    http = session or requests
+    probe = (probes or {}).get(repo['name'])
+    if is_known_miss(probe, repo):
+        return None
+
+    urls = catalogue_candidate_urls(username, repo)
+    end = time.monotonic() + CATALOGUE_PROBE_DEADLINE
+
+    hint = (probe or {}).get('url')
+    if hint in urls:
+        metadata, _ = probe_catalogue_url(http, hint, CATALOGUE_PROBE_TIMEOUT)
+        if metadata is not None:
+            if probes is not None and probe.get('unresolved'):
+                probes[repo['name']] = {key: value for key, value in probe.items() if key != 'unresolved'}
+            return metadata
+
+    metadata, url, answered = probe_catalogue_urls(http, urls, max(end - time.monotonic(), 0.1))
+    if probes is None:
+        return metadata
+    if not answered:
+        # Keep the last known location for the next run's hint
+        probes[repo['name']] = dict(probe or {}, unresolved=True)
+    else:
+        probes[repo['name']] = {
+            'url': url,
+            'checkedAt': datetime.now(timezone.utc).isoformat(),
+            'pushedAt': repo.get('pushed_at'),
+            'homepage': repo.get('homepage')
+        }
+    return metadata
 
 def determine_kind(metadata: Dict, repo_topics: List[str]) -> Tuple[str, List[str]]:
     """Derive primary kind and topic hierarchy."""
@@ -159,32 +363,100 @@ def resolve_screenshot_url(username: str, repo: Dict, metadata: Dict) -> str:
     return f'https://raw.githubusercontent.com/{username}/{repo["name"]}/{default_branch}/screenshot.png'
 
 
-def build_catalogue_entries(username: str, repos: List[Dict]) -> List[Dict]:
+def build_catalogue_entry(username: str, repo: Dict, session=None,
+                          probes: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Build one catalogue entry, fetching the repo's catalogue.json metadata."""
+    metadata = fetch_catalogue_metadata(username, repo, session, probes) or {}
+    topics = repo.get('topics', [])
+    kind, topic_path = determine_kind(metadata, topics)
+    categories = metadata.get('categories', [])
+    if topic_path:
+        categories = categories + topic_path
+    return {
+        'id': metadata.get('id') or repo['name'],
+        'title': metadata.get('title') or repo['name'],
+        'oneLiner': metadata.get('oneLiner') or repo.get('description') or 'GitHub repository',
+        'categories': categories,
+        'tags': metadata.get('tags', []),
+        'demoUrl': metadata.get('demoUrl') or repo.get('homepage') or repo['html_url'],
+        'githubUrl': repo['html_url'],
+        'screenshot': resolve_screenshot_url(username, repo, metadata),
+        'status': metadata.get('status'),
+        'kind': kind,
+        'topicHierarchy': topic_path,
+        'repoTopics': topics,
+        'lastCommit': repo['last_commit_date'].isoformat() if repo.get('last_commit_date') else None,
+        'createdAt': repo.get('created_at')
+    }
+
+def load_catalogue_state() -> Dict:
+    """Load the per-repo pushed_at/updated_at watermarks from the last build."""
+    state = load_json_state(CATALOGUE_STATE_FILE)
+    return state if state.get('version') == CATALOGUE_STATE_VERSION else {}
+
+def load_previous_entries() -> Dict[str, Dict]:
+    """Index the entries of the current catalogue_data.json by id."""
+    try:
+        items = load_catalogue(CATALOGUE_FILE)['items']
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return {item.get('id'): item for item in items}
+
+def build_catalogue_entries(username: str, repos: List[Dict], session=None,
+                            incremental: bool = False) -> List[Dict]:
+    """Build catalogue entries for all repos.
+
+    In incremental mode, a repo whose pushed_at and updated_at match the
+    previous build reuses its entry from catalogue_data.json instead of
+    re-fetching catalogue.json and re-resolving the screenshot. An entry
+    whose catalogue.json lookup was unresolved isn't reused next time.
+    """
+    state = load_catalogue_state()
+    previous_repos = state.get('repos', {})
+    # Where each repo's catalogue.json was (or wasn't) found last run
+    probes = load_json_state(CATALOGUE_PROBE_FILE)
+    previous_entries = load_previous_entries() if incremental else {}
+
     entries = []
+    new_repos = {}
+    rebuilt = reused = known_misses = 0
+    rebuild_seconds = 0.0
     for repo in repos:
-        metadata = fetch_catalogue_metadata(username, repo) or {}
-        topics = repo.get('topics', [])
-        kind, topic_path = determine_kind(metadata, topics)
-        categories = metadata.get('categories', [])
-        if topic_path:
-            categories = categories + topic_path
-        entry = {
-            'id': metadata.get('id') or repo['name'],
-            'title': metadata.get('title') or repo['name'],
-            'oneLiner': metadata.get('oneLiner') or repo.get('description') or 'GitHub repository',
-            'categories': categories,
-            'tags': metadata.get('tags', []),
-            'demoUrl': metadata.get('demoUrl') or repo.get('homepage') or repo['html_url'],
-            'githubUrl': repo['html_url'],
-            'screenshot': resolve_screenshot_url(username, repo, metadata),
-            'status': metadata.get('status'),
-            'kind': kind,
-            'topicHierarchy': topic_path,
-            'repoTopics': topics,
-            'lastCommit': repo['last_commit_date'].isoformat() if repo.get('last_commit_date') else None,
-            'createdAt': repo.get('created_at')
-        }
+        watermark = {'pushed_at': repo.get('pushed_at'), 'updated_at': repo.get('updated_at')}
+        prior = previous_repos.get(repo['name'])
+        entry = None
+        if (incremental and prior and repo.get('pushed_at')
+                and prior['pushed_at'] == watermark['pushed_at']
+                and prior['updated_at'] == watermark['updated_at']):
+            entry = previous_entries.get(prior['id'])
+        if entry is not None:
+            reused += 1
+        else:
+            if is_known_miss(probes.get(repo['name']), repo):
+                known_misses += 1
+            start = time.perf_counter()
+            entry = build_catalogue_entry(username, repo, session, probes)
+            rebuild_seconds += time.perf_counter() - start
+            rebuilt += 1
+        if not probes.get(repo['name'], {}).get('unresolved'):
+            new_repos[repo['name']] = dict(watermark, id=entry['id'])
         entries.append(entry)
+
+    # Average cost of a rebuild, kept so a fully reused run can still estimate savings
+    avg_rebuild = rebuild_seconds / rebuilt if rebuilt else state.get('avgRebuildSeconds', 0.0)
+    if incremental:
+        print(f"♻️  Incremental catalogue: {rebuilt} rebuilt, {reused} reused "
+              f"(~{reused * avg_rebuild:.1f}s saved)")
+    if known_misses:
+        print(f"🚫 Skipped probing {known_misses} unchanged repos with no {CATALOGUE_ENTRY_FILE}")
+
+    save_json_state(CATALOGUE_PROBE_FILE, probes)
+    if entries:
+        save_json_state(CATALOGUE_STATE_FILE, {
+            'version': CATALOGUE_STATE_VERSION,
+            'avgRebuildSeconds': avg_rebuild,
+            'repos': new_repos
+        })
     return entries
 
 def write_catalogue_file(entries: List[Dict]):
@@ -194,69 +466,68 @@ def write_catalogue_file(entries: List[Dict]):
         print("   Set GITHUB_TOKEN environment variable and try again.")
         return
     
-    # Preserve manually added entries that aren't in GitHub
-    existing_entries = []
-    if os.path.exists(CATALOGUE_FILE):
-        try:
-            with open(CATALOGUE_FILE, 'r', encoding='utf-8') as fh:
-                existing_data = json.load(fh)
-                existing_entries = existing_data.get('items', [])
-        except (json.JSONDecodeError, IOError):
-            pass
-    
-    # Get IDs from GitHub entries
-    github_ids = {entry['id'] for entry in entries}
+    try:
+        store = CatalogueStore.open(CATALOGUE_FILE)
+    except (json.JSONDecodeError, IOError):
+        store = CatalogueStore({'items': []}, CATALOGUE_FILE)
     
-    # Keep manual entries that aren't in GitHub
-    manual_entries = [e for e in existing_entries if e.get('id') not in github_ids]
+    # Carry over thumbnails for unchanged screenshots; build_thumbnails.py
+    # owns that field and would otherwise make every run look like a change
+    for entry in entries:
+        previous = store.get(entry['id'])
+        if previous and previous.get('thumbnail') and previous.get('screenshot') == entry['screenshot']:
+            entry['thumbnail'] = previous['thumbnail']
     
-    if manual_entries:
-        print(f"📝 Preserving {len(manual_entries)} manually added entries")
+    # GitHub entries replace the previous GitHub set; manual and
+    # private-deployment entries are preserved
+    kept, dropped = store.replace_source(entries, 'github')
+    if kept:
+        print(f"📝 Preserving {kept} manually added entries")
+    if dropped:
+        print(f"🗑️  Removed {dropped} entries for repos no longer on GitHub")
     
-    # Combine: GitHub entries + manual entries
-    all_entries = entries + manual_entries
-    
-    payload = {
-        'generatedAt': datetime.now(timezone.utc).isoformat(),
-        'items': all_entries
-    }
-    with open(CATALOGUE_FILE, 'w', encoding='utf-8') as fh:
-        json.dump(payload, fh, indent=2)
+    if not store.save():
+        print("No catalogue changes since the last run.")
+
+
+def render_projects_html(repos: List[Dict]) -> str:
+    """Render the Recent Projects list."""
+    items = []
+    for repo in repos:
+        description = repo['description'] or 'GitHub repository'
+        items.append(f'<li><a href="{escape_attr(repo["html_url"])}" target="_blank">'
+                     f'{escape_text(repo["name"])}</a> - {escape_text(description)}</li>')
+    return render_list(items)
 
 
 def update_html_file(repos, html_file):
-    """Update the index.html file with sorted repositories."""
-    with open(html_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    """Save the sorted repositories to data/projects.json and re-render index.html."""
+    save_section_data('projects', repos)
+    render_index(output=html_file)
 
-    # Parse HTML
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    # Find the projects section
-    projects_section = soup.find('h2', {'id': 'projects'}).find_next('ul')
+
+def update_catalogue(username: str, token: Optional[str], session, graphql: bool = False,
+                     incremental: bool = False) -> Tuple[List[Dict], List[Dict]]:
+    """Fetch repos, rebuild catalogue_data.json and return (repos, catalogue entries)."""
+    # Pass --graphql to use the batched GraphQL backend instead of REST; the
+    # output is identical, so `git diff catalogue_data.json` compares the two.
+    if graphql and token:
+        repos = get_github_repos_graphql(username, token, session=session)
+    else:
+        if graphql:
+            print("⚠️  --graphql requires GITHUB_TOKEN - falling back to the REST API")
+        repos = get_github_repos(username, token, session=session)
     
-    # Create new repository list items
-    new_items = []
-    for repo in repos:
-        description = repo['description'] or 'GitHub repository'
-        li = soup.new_tag('li')
-        a = soup.new_tag('a', href=repo['html_url'], target='_blank')
-        a.string = repo['name']
-        li.append(a)
-        li.append(f' - {description}')
-        new_items.append(str(li))
-
-    # Replace old list with new one
-    projects_html = '<ul>\n    ' + '\n    '.join(new_items) + '\n</ul>'
+    # Build catalogue data. With --incremental, repos whose pushed_at/updated_at
+    # are unchanged since the last run reuse their entry.
+    catalogue_entries = build_catalogue_entries(username, repos, session=session, incremental=incremental)
     
-    # Replace the old projects section with the new one
-    old_projects_pattern = r'<h2 id="projects">Recent Projects</h2>\s*<ul>.*?</ul>'
-    new_projects_section = f'<h2 id="projects">Recent Projects</h2>\n{projects_html}'
-    updated_content = re.sub(old_projects_pattern, new_projects_section, content, flags=re.DOTALL)
+    # HEAD every screenshot so known-missing ones render the placeholder
+    # directly instead of costing each visitor a failed image request
+    validate_screenshots(catalogue_entries, session=session)
+    write_catalogue_file(catalogue_entries)
+    return repos, catalogue_entries
 
-    # Write the updated content back to the file
-    with open(html_file, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
 
 if __name__ == '__main__':
     # GitHub username
@@ -270,12 +541,14 @@ if __name__ == '__main__':
     # Path to your index.html file
     HTML_FILE = 'index.html'
     
-    # Get sorted repositories
-    repos = get_github_repos(USERNAME, TOKEN)
+    # One pooled session for every request; unchanged GET responses are
+    # revalidated from the on-disk HTTP cache (HTTP_CACHE=0 disables it)
+    session = create_session(TOKEN, accept=REPO_ACCEPT)
     
-    # Build catalogue data and write to file
-    catalogue_entries = build_catalogue_entries(USERNAME, repos)
-    write_catalogue_file(catalogue_entries)
+    # Set GITHUB_WORKERS=1 to fetch commit dates serially
+    repos, catalogue_entries = update_catalogue(USERNAME, TOKEN, session,
+                                                graphql='--graphql' in sys.argv,
+                                                incremental='--incremental' in sys.argv)
     
     # Filter repos for textual list display
     project_repos = [repo for repo in repos if True]
@@ -284,4 +557,6 @@ if __name__ == '__main__':
     update_html_file(project_repos, HTML_FILE)
     
     print(f"Updated {HTML_FILE} with {len(project_repos)} repositories, sorted by last commit date.")
-    print(f"Wrote catalogue metadata for {len(catalogue_entries)} repositories to {CATALOGUE_FILE}.")
\ No newline at end of file
+    print(f"Wrote catalogue metadata for {len(catalogue_entries)} repositories to {CATALOGUE_FILE}.")
+    print_cache_summary(session)
+    print_rate_limit_summary(session)